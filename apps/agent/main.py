@@ -6,6 +6,7 @@ import logging
 import uuid
 import time
 import asyncio
+from dataclasses import asdict
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import Dict, Any, Optional, List
@@ -17,7 +18,7 @@ try:
     import sys
     project_root = Path(__file__).parent.parent.parent
     sys.path.insert(0, str(project_root))
-    from apps.ui.utils.approval_workflow import approval_workflow
+    from apps.ui.utils.approval_workflow import get_approval_workflow
     from apps.ui.utils.database import DatabaseManager
     print("✅ Using full Portia SDK with production workflow")
     USING_REAL_PORTIA = True
@@ -28,9 +29,10 @@ except Exception as e:
     Portia = None
     PlanBuilder = None
     Tool = None
+    get_approval_workflow = None
 
 # Import your custom tools
-from tools.reddit_tool import RedditTool
+from tools.reddit_tool import RedditTool, RedditCreds
 from tools.rag_tool import RAGTool
 from tools.moderation_tools import analyze_text as ModerationTool_analyze_text
 
@@ -80,20 +82,14 @@ rag_tool = RAGTool()
 def get_reddit_tool() -> RedditTool:
     global reddit_tool
     if isinstance(reddit_tool, _LazyRedditToolProxy):
-        client_id = _env("REDDIT_CLIENT_ID")
-        client_secret = _env("REDDIT_CLIENT_SECRET")
-        username = _env("REDDIT_USERNAME")
-        password = _env("REDDIT_PASSWORD")
-        if not (client_id and client_secret and username and password):
+        creds = RedditCreds.from_env()
+        if not creds.complete:
             raise ValueError(
                 "Reddit API credentials (CLIENT_ID, CLIENT_SECRET, USERNAME, PASSWORD) are not configured."
             )
         reddit_tool = RedditTool(
-            client_id=client_id,
-            client_secret=client_secret,
-            username=username,
-            password=password,
-            user_agent=f"oss-community-agent/0.1 (by u/{username or 'unknown'})",
+            **asdict(creds),
+            user_agent=f"oss-community-agent/0.1 (by u/{creds.username or 'unknown'})",
         )
     return reddit_tool
 
@@ -247,12 +243,12 @@ class ApprovalManagerTool(Tool):
                 if not post_data:
                     return {"success": False, "error": "No post data provided"}
                 
-                result = approval_workflow.process_reddit_query(post_data)
+                result = get_approval_workflow().process_reddit_query(post_data)
                 return result
                 
             elif action == "get_pending":
-                pending = approval_workflow.get_pending_requests()
-                stats = approval_workflow.get_request_stats()
+                pending = get_approval_workflow().get_pending_requests()
+                stats = get_approval_workflow().get_request_stats()
                 return {
                     "success": True,
                     "pending_requests": pending,
@@ -263,7 +259,7 @@ class ApprovalManagerTool(Tool):
                 if not request_id:
                     return {"success": False, "error": "No request_id provided"}
                 
-                result = approval_workflow.approve_request(
+                result = get_approval_workflow().approve_request(
                     request_id=request_id,
                     admin_feedback=kwargs.get('feedback', ''),
                     edited_reply=kwargs.get('edited_reply', '')
@@ -274,7 +270,7 @@ class ApprovalManagerTool(Tool):
                 if not request_id:
                     return {"success": False, "error": "No request_id provided"}
                 
-                result = approval_workflow.reject_request(
+                result = get_approval_workflow().reject_request(
                     request_id=request_id,
                     admin_feedback=kwargs.get('feedback', '')
                 )
@@ -360,7 +356,7 @@ def run_oss_agent(query: str, subreddit: str, submission_id: Optional[str] = Non
     logging.info(f"[{run_id}] OSS Community Agent initiated with query: '{query}' on subreddit: '{subreddit}'.")
     logging.info(f"[{run_id}] Dry Run Mode: {DRY_RUN}.")
 
-    if not approval_workflow:
+    if not get_approval_workflow:
         return {"status": "failed", "error": "Approval workflow not available"}
 
     try:
@@ -384,35 +380,39 @@ def run_oss_agent(query: str, subreddit: str, submission_id: Optional[str] = Non
         # Phase 2: Process posts through approval workflow
         processed_requests = []
         if reddit_posts:
-            for post in reddit_posts[:3]:  # Limit to first 3 posts
-                try:
-                    # Add required fields for approval workflow
-                    post_data = {
-                        'id': post.get('id'),
-                        'title': post.get('title', ''),
-                        'selftext': post.get('selftext', ''),
-                        'subreddit': subreddit,
-                        'author': 'unknown',
-                        'url': post.get('url', '')
-                    }
-                    
-                    logging.info(f"[{run_id}] Processing post: {post_data['title'][:50]}...")
-                    result = approval_workflow.process_reddit_query(post_data)
-                    
-                    if result['success']:
-                        processed_requests.append({
-                            'request_id': result['request_id'],
-                            'post_id': post_data['id'],
-                            'title': post_data['title'],
-                            'confidence': result['confidence']
-                        })
-                        logging.info(f"[{run_id}] Successfully queued request {result['request_id']}")
-                    else:
-                        logging.warning(f"[{run_id}] Failed to process post: {result.get('error')}")
-                        
-                except Exception as e:
-                    logging.error(f"[{run_id}] Error processing post: {e}")
-                    continue
+            # Add required fields for approval workflow
+            posts_to_draft = [
+                {
+                    'id': post.get('id'),
+                    'title': post.get('title', ''),
+                    'selftext': post.get('selftext', ''),
+                    'subreddit': subreddit,
+                    'author': 'unknown',
+                    'url': post.get('url', '')
+                }
+                for post in reddit_posts[:3]  # Limit to first 3 posts
+            ]
+            for post_data in posts_to_draft:
+                logging.info(f"[{run_id}] Processing post: {post_data['title'][:50]}...")
+            
+            # One batched retrieval for every post; the LLM calls still run side by side via llm.batch
+            try:
+                results = get_approval_workflow().process_reddit_queries(posts_to_draft)
+            except Exception as e:
+                logging.error(f"[{run_id}] Error processing posts: {e}")
+                results = []
+            
+            for post_data, result in zip(posts_to_draft, results):
+                if result['success']:
+                    processed_requests.append({
+                        'request_id': result['request_id'],
+                        'post_id': post_data['id'],
+                        'title': post_data['title'],
+                        'confidence': result['confidence']
+                    })
+                    logging.info(f"[{run_id}] Successfully queued request {result['request_id']}")
+                else:
+                    logging.warning(f"[{run_id}] Failed to process post: {result.get('error')}")
         else:
             logging.info(f"[{run_id}] No Reddit posts found, creating a sample request for testing")
             # Create a sample request for testing purposes
@@ -425,7 +425,7 @@ def run_oss_agent(query: str, subreddit: str, submission_id: Optional[str] = Non
                 'url': f'https://reddit.com/r/{subreddit}/sample'
             }
             
-            result = approval_workflow.process_reddit_query(sample_post)
+            result = get_approval_workflow().process_reddit_query(sample_post)
             if result['success']:
                 processed_requests.append({
                     'request_id': result['request_id'],
@@ -435,8 +435,8 @@ def run_oss_agent(query: str, subreddit: str, submission_id: Optional[str] = Non
                 })
         
         # Phase 3: Get pending requests
-        pending_requests = approval_workflow.get_pending_requests()
-        stats = approval_workflow.get_request_stats()
+        pending_requests = get_approval_workflow().get_pending_requests()
+        stats = get_approval_workflow().get_request_stats()
         
         # Phase 4: Modern Portia Integration (for future enhancements)
         portia_status = "available" if portia_client else "not_configured"
@@ -539,8 +539,8 @@ async def run_portia_oss_agent(query: str, subreddit: str) -> Dict[str, Any]:
             logging.info(f"[{run_id}] Portia plan completed successfully")
             
             # Get final stats
-            stats = approval_workflow.get_request_stats()
-            pending = approval_workflow.get_pending_requests()
+            stats = get_approval_workflow().get_request_stats()
+            pending = get_approval_workflow().get_pending_requests()
             
             return {
                 "status": "completed",
@@ -568,7 +568,7 @@ async def run_portia_oss_agent(query: str, subreddit: str) -> Dict[str, Any]:
                 "run_id": run_id,
                 "portia_plan_run_id": str(plan_run.id),
                 "clarification_needed": plan_run.current_clarification.message if hasattr(plan_run, 'current_clarification') else "Human approval required",
-                "pending_requests": approval_workflow.get_pending_requests(),
+                "pending_requests": get_approval_workflow().get_pending_requests(),
                 "total_duration_sec": round(time.time() - start_time, 2)
             }
             
@@ -622,8 +622,8 @@ def disable_live_posting():
 
 def get_agent_status() -> Dict[str, Any]:
     """Get current status of the OSS Community Agent"""
-    stats = approval_workflow.get_request_stats()
-    pending = approval_workflow.get_pending_requests()
+    stats = get_approval_workflow().get_request_stats()
+    pending = get_approval_workflow().get_pending_requests()
     
     return {
         "agent_ready": USING_REAL_PORTIA and portia_client is not None,
@@ -631,7 +631,7 @@ def get_agent_status() -> Dict[str, Any]:
         "portia_available": USING_REAL_PORTIA,
         "reddit_configured": bool(_env("REDDIT_CLIENT_ID")),
         "ai_configured": bool(_env("GROQ_API_KEY") or _env("LLM_PROVIDER") != "none"),
-        "database_available": approval_workflow.db is not None,
+        "database_available": get_approval_workflow().db is not None,
         "request_stats": stats,
         "pending_approvals": len(pending),
         "total_processed": stats.get('total', 0)
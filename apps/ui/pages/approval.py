@@ -3,7 +3,7 @@ import json
 from datetime import datetime
 import sys
 import os
-from utils.reddit_client import get_subreddit_data  # 🔑 Reddit data fetch
+from utils.reddit_client import get_subreddit_data, get_subreddits_data  # 🔑 Reddit data fetch
 from utils.scheduler import start_scheduler, ingest_unanswered_queries
 from utils.agent_integration import generate_draft_with_groq  # Groq API integration
 
@@ -16,7 +16,8 @@ if parent_dir not in sys.path:
 from utils.database import DatabaseManager
 from utils.helpers import (
     format_timestamp, create_status_badge, format_confidence_score,
-    parse_citations, format_processing_time, sanitize_input
+    parse_citations, format_processing_time, sanitize_input,
+    db_version, cached_pending_requests
 )
 from utils.agent_integration import agent_integration
 
@@ -155,7 +156,7 @@ def render_approval_page():
 
     # Get pending requests
 # Get pending requests first
-    pending_requests = db.get_pending_requests()
+    pending_requests = cached_pending_requests(db, db_version(db))
     filtered_requests = apply_filters(pending_requests, subreddit_filter, confidence_filter, sort_option)
 
     # Show summary stats
@@ -202,8 +203,10 @@ def render_approval_page():
 
     if filtered_requests:
         st.markdown(f"<p style='color: var(--text-secondary); margin-bottom: 1rem;'>Showing {len(filtered_requests)} of {len(pending_requests)} requests</p>", unsafe_allow_html=True)
+        # Fetch the context post for every subreddit in the queue at once instead of per card
+        subreddit_context = get_subreddits_data((r.get('subreddit', '') for r in filtered_requests), limit=1)
         for i, request in enumerate(filtered_requests):
-            render_request_review(request, db, i)
+            render_request_review(request, db, i, subreddit_context)
     else:
         st.info("No requests match your current filters.")
 
@@ -233,7 +236,7 @@ def apply_filters(requests, subreddit_filter, confidence_filter, sort_option):
     return filtered
 
 
-def render_request_review(request, db, index):
+def render_request_review(request, db, index, subreddit_context=None):
     """Render individual request review card with on-demand answer generation"""
     with st.expander(
         f"📝 {request.get('post_title', 'No Title')[:80]}{'...' if len(request.get('post_title', '')) > 80 else ''} "
@@ -290,7 +293,11 @@ def render_request_review(request, db, index):
 
         # Extra context from subreddit
         st.markdown(f"### 🔗 Context from r/{request.get('subreddit', 'Unknown')}")
-        reddit_data = get_subreddit_data(request.get('subreddit', ''), limit=1)
+        subreddit = request.get('subreddit', '')
+        if subreddit_context is not None and subreddit in subreddit_context:
+            reddit_data = subreddit_context[subreddit]
+        else:
+            reddit_data = get_subreddit_data(subreddit, limit=1)
         if isinstance(reddit_data, dict) and reddit_data.get("error"):
             st.error(f"Error fetching subreddit: {reddit_data['error']}")
         else:
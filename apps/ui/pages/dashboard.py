@@ -17,7 +17,8 @@ if parent_dir not in sys.path:
 from utils.database import DatabaseManager
 from utils.helpers import (
     create_metric_card, format_timestamp, get_chart_colors,
-    calculate_metrics_change, create_status_badge
+    calculate_metrics_change, create_status_badge,
+    db_version, cached_analytics_overview, cached_daily_stats, cached_daily_stats_df
 )
 
 def render_dashboard():
@@ -39,8 +40,9 @@ def render_dashboard():
     """, unsafe_allow_html=True)
     
     # Get analytics data
-    overview_data = db.get_analytics_overview()
-    daily_stats = db.get_daily_stats(30)
+    version = db_version(db)
+    overview_data = cached_analytics_overview(db, version)
+    df_daily = cached_daily_stats_df(db, 30, version)
     
     # Key Metrics Row
     st.markdown("<h2 style='margin: 2rem 0 1rem 0; color: var(--text-primary);'>📊 Key Metrics</h2>", unsafe_allow_html=True)
@@ -49,7 +51,7 @@ def render_dashboard():
     
     with col1:
         # Requests today with comparison to yesterday
-        yesterday_data = db.get_daily_stats(2)
+        yesterday_data = cached_daily_stats(db, 2, version)
         yesterday_count = yesterday_data[1]['total_requests'] if len(yesterday_data) > 1 else 0
         change, change_type = calculate_metrics_change(overview_data['total_today'], yesterday_count)
         change_text = f"{'↗️' if change_type == 'positive' else '↘️' if change_type == 'negative' else '➖'} {change:.1f}% vs yesterday"
@@ -87,13 +89,11 @@ def render_dashboard():
     # Charts Row
     st.markdown("<h2 style='margin: 3rem 0 1rem 0; color: var(--text-primary);'>📈 Performance Analytics</h2>", unsafe_allow_html=True)
     
-    if daily_stats:
+    if not df_daily.empty:
         col1, col2 = st.columns(2)
         
         with col1:
             # Daily Requests Chart
-            df_daily = pd.DataFrame(daily_stats)
-            df_daily['date'] = pd.to_datetime(df_daily['date'])
             df_daily = df_daily.sort_values('date')
             
             fig_daily = go.Figure()
@@ -177,7 +177,7 @@ def render_dashboard():
         st.markdown("<h3 style='color: var(--text-primary); margin-bottom: 1rem;'>🕒 Recent Activity</h3>", unsafe_allow_html=True)
         
         # Get recent requests
-        recent_requests = db.get_requests_by_filter({'limit': 5})
+        recent_requests = db.get_recent_requests(5)
         
         if recent_requests:
             for request in recent_requests:
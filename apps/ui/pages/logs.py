@@ -85,8 +85,8 @@ def render_filters_section(db):
         with col3:
             # Subreddit filter
             st.markdown("**🏷️ Subreddit**")
-            all_requests = db.get_requests_by_filter({'limit': 1000})
-            unique_subreddits = list(set(r['subreddit'] for r in all_requests if r['subreddit']))
+            filter_options = db.get_filter_options()
+            unique_subreddits = filter_options['subreddits']
             
             selected_subreddits = st.multiselect(
                 "Filter by subreddit:",
@@ -119,7 +119,7 @@ def render_filters_section(db):
         
         with col2:
             # Author filter
-            authors = list(set(r.get('post_author', '') for r in all_requests if r.get('post_author')))
+            authors = filter_options['authors']
             selected_authors = st.multiselect(
                 "👤 Filter by author:",
                 options=authors,
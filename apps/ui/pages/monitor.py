@@ -125,7 +125,7 @@ def render_activity_feed(db):
     st.markdown("<h2 style='margin: 2rem 0 1rem 0; color: var(--text-primary);'>📡 Live Activity Feed</h2>", unsafe_allow_html=True)
     
     # Get recent requests for activity simulation
-    recent_requests = db.get_requests_by_filter({'limit': 10})
+    recent_requests = db.get_recent_requests(10)
     
     col1, col2 = st.columns([2, 1])
     
@@ -1,10 +1,14 @@
 # apps/ui/streamlit_app.py
 
 import streamlit as st
+import importlib
+import logging
 import os
 import sys
 from pathlib import Path
 
+logging.basicConfig(level=logging.INFO)
+
 # Add current directory to path for imports
 current_dir = Path(__file__).parent
 if str(current_dir) not in sys.path:
@@ -27,25 +31,27 @@ try:
 except ImportError:
     agent_integration = None
 
-try:
-    from pages.dashboard import render_dashboard
-    from pages.approval import render_approval_page
-    from pages.logs import render_logs_page
-    from pages.monitor import render_monitor_page
-    from pages.settings import render_settings_page
-except ImportError as e:
-    st.error(f"Failed to import page modules: {e}")
-    # Define fallback functions
-    def render_dashboard():
-        st.error("Dashboard page not available")
-    def render_approval_page():
-        st.error("Approval page not available")
-    def render_logs_page():
-        st.error("Logs page not available")
-    def render_monitor_page():
-        st.error("Monitor page not available")
-    def render_settings_page():
-        st.error("Settings page not available")
+# Page key -> (module, render function). Page modules pull in plotly/pandas, so they
+# are imported on first navigation instead of at startup; later reruns hit sys.modules.
+_PAGE_RENDERERS = {
+    'dashboard': ('pages.dashboard', 'render_dashboard'),
+    'approval': ('pages.approval', 'render_approval_page'),
+    'logs': ('pages.logs', 'render_logs_page'),
+    'monitor': ('pages.monitor', 'render_monitor_page'),
+    'settings': ('pages.settings', 'render_settings_page'),
+}
+
+# Sidebar status indicator; anything not listed renders as red
+_STATUS_EMOJI = {'healthy': '🟢', 'warning': '🟡'}
+
+def _load_page_renderer(page_key: str):
+    """Import the page module for page_key on demand and return its render function"""
+    module_name, func_name = _PAGE_RENDERERS.get(page_key, _PAGE_RENDERERS['dashboard'])
+    try:
+        return getattr(importlib.import_module(module_name), func_name)
+    except ImportError as e:
+        st.error(f"Failed to import page module '{module_name}': {e}")
+        return None
 
 def main():
     """Main Streamlit application"""
@@ -103,23 +109,21 @@ def render_app():
     with st.sidebar:
         render_sidebar()
     
-    # Render the selected page
+    # Render the selected page (unknown keys fall back to the dashboard)
     current_page = st.session_state.get('current_page', 'dashboard')
-    
-    if current_page == 'dashboard':
-        render_dashboard()
-    elif current_page == 'approval':
-        render_approval_page()
-    elif current_page == 'logs':
-        render_logs_page()
-    elif current_page == 'monitor':
-        render_monitor_page()
-    elif current_page == 'settings':
-        render_settings_page()
-    else:
-        # Default to dashboard
-        render_dashboard()
+    render_page = _load_page_renderer(current_page)
+    if render_page:
+        render_page()
+
+# Streamlit >= 1.37 exposes st.fragment (older releases ship st.experimental_fragment).
+# Running the sidebar as a fragment means its buttons only rerun the sidebar, not the
+# whole page; fall back to a plain function on versions without fragment support.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+def _sidebar_fragment(func):
+    return _fragment(func) if _fragment else func
 
+@_sidebar_fragment
 def render_sidebar():
     """Render the sidebar navigation"""
     
@@ -161,8 +165,10 @@ def render_sidebar():
             use_container_width=True,
             type="primary" if is_active else "secondary"
         ):
-            st.session_state.current_page = page_key
-            st.rerun()
+            # Only rerun the full app when the page actually changes
+            if page_key != current_page:
+                st.session_state.current_page = page_key
+                st.rerun()
     
     # Quick stats section
     st.markdown("---")
@@ -183,7 +189,7 @@ def render_sidebar():
             
             # System status
             status = health.get('status', 'unknown')
-            status_color = "🟢" if status == 'healthy' else "🟡" if status == 'warning' else "🔴"
+            status_color = _STATUS_EMOJI.get(status, '🔴')
             st.markdown(f"**Status:** {status_color} {status.title()}")
         else:
             # Show default stats when agent_integration is not available
@@ -200,17 +206,22 @@ def render_sidebar():
     # Manual scan button
     if st.button("🔍 Start Manual Scan", use_container_width=True):
         if agent_integration:
-            with st.expander("Manual Scan Options", expanded=True):
-                subreddit = st.text_input("Subreddit", value="learnpython", placeholder="Enter subreddit name")
-                keywords = st.text_input("Keywords", value="", placeholder="Optional keywords")
-                
-                if st.button("🚀 Start Scan"):
-                    run_id = agent_integration.start_agent_monitoring(subreddit, keywords)
-                    st.success(f"✅ Manual scan started! Run ID: `{run_id[:8]}...`")
-                    st.info("Check the Monitor page for real-time progress.")
+            st.session_state.show_manual_scan = not st.session_state.get('show_manual_scan', False)
         else:
             st.warning("⚠️ Agent integration not available. Please check configuration.")
     
+    # Only build the option widgets while the panel is open
+    if agent_integration and st.session_state.get('show_manual_scan'):
+        with st.expander("Manual Scan Options", expanded=True):
+            subreddit = st.text_input("Subreddit", value="learnpython", placeholder="Enter subreddit name")
+            keywords = st.text_input("Keywords", value="", placeholder="Optional keywords")
+            
+            if st.button("🚀 Start Scan"):
+                run_id = agent_integration.start_agent_monitoring(subreddit, keywords)
+                st.session_state.show_manual_scan = False
+                st.success(f"✅ Manual scan started! Run ID: `{run_id[:8]}...`")
+                st.info("Check the Monitor page for real-time progress.")
+    
     # Emergency stop
     if st.button("⏹️ Emergency Stop", use_container_width=True, type="secondary"):
         if agent_integration:
@@ -5,20 +5,105 @@ import os
 import uuid
 import time
 import asyncio
-from typing import Dict, Any, Optional, List
+import functools
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
+from pathlib import Path
 import threading
-import json
+import atexit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import portia  # Ensure Portia package is importable
 
-# Ensure 'apps/ui' is on sys.path so 'utils' package can be imported reliably
-base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if base_dir not in sys.path:
-    sys.path.insert(0, base_dir)
+# Ensure 'apps/ui' is on sys.path so 'utils' package can be imported reliably.
+# Skip the path work entirely when 'utils' is already importable (e.g. under streamlit_app).
+if 'utils.database' not in sys.modules:
+    _UI_DIR = str(Path(__file__).resolve().parents[1])
+    if _UI_DIR not in sys.path:
+        sys.path.insert(0, _UI_DIR)
 
-from utils.database import DatabaseManager
+# JSON helpers shared with the database layer, so both encode the same way
+from utils.database import DatabaseManager, STATUS_PENDING, json_dumps, json_loads
+
+# Run statuses reported by get_all_active_runs
+ACTIVE_RUN_STATUSES = frozenset({'running', 'processing', 'searching', 'moderating'})
+# Terminal run statuses; such runs are evicted from memory after _RUN_RETENTION_SECONDS
+_FINISHED_RUN_STATUSES = frozenset({'completed', 'failed', 'stopped'})
+_RUN_RETENTION_SECONDS = 3600
+# Seconds that get_agent_health/get_system_metrics results are reused across reruns
+HEALTH_CACHE_TTL = 2.0
+# Number of recently seen Reddit post_ids remembered to skip repeat DB lookups
+_SEEN_POST_IDS_MAX = 10_000
+# Seconds a run may go without a heartbeat (beyond its scan interval) before it counts as stalled
+_RUN_HEARTBEAT_TIMEOUT = 300
+# Reddit post keys copied into each request row, in _build_request_row unpacking order
+_POST_FIELDS = ('id', 'title', 'selftext', 'author', 'url', 'subreddit')
+_EMPTY_CITATIONS = json_dumps([])
+
+# Seed rows for _initialize_demo_data; citations are pre-encoded and each call adds a fresh id
+_DEMO_REQUESTS_TEMPLATE = (
+    {
+        'subreddit': 'learnpython',
+        'post_id': 'sample_001',
+        'post_title': 'How do I install Python on Windows?',
+        'post_content': 'I\'m new to programming and want to install Python on my Windows 10 computer. Can someone guide me through the process?',
+        'post_author': 'pythonbeginner123',
+        'post_url': 'https://reddit.com/r/learnpython/sample_001',
+        'status': STATUS_PENDING,
+        'drafted_reply': 'To install Python on Windows, you can follow these steps:\n\n1. Go to python.org\n2. Download the latest Python installer\n3. Run the installer and check "Add Python to PATH"\n4. Verify installation by opening Command Prompt and typing `python --version`\n\nThis should get you started with Python development on Windows!',
+        'moderation_score': 0.1,
+        'agent_confidence': 0.85,
+        'citations': json_dumps([
+            {'title': 'Python Installation Guide', 'source': 'python.org'},
+            {'title': 'Windows Setup Documentation', 'source': 'docs.python.org'}
+        ]),
+        'processing_time': 2.3
+    },
+    {
+        'subreddit': 'django',
+        'post_id': 'sample_002',
+        'post_title': 'Django models vs SQLAlchemy - which is better?',
+        'post_content': 'I\'m starting a new web project and wondering whether to use Django ORM or SQLAlchemy. What are the pros and cons?',
+        'post_author': 'webdev_curious',
+        'post_url': 'https://reddit.com/r/django/sample_002',
+        'status': STATUS_PENDING,
+        'drafted_reply': 'Both Django ORM and SQLAlchemy are excellent choices, but they serve different purposes:\n\n**Django ORM:**\n- Integrated with Django framework\n- Convention over configuration\n- Great for rapid development\n- Active Record pattern\n\n**SQLAlchemy:**\n- Framework agnostic\n- More flexible and powerful\n- Data Mapper pattern\n- Better for complex queries\n\nChoose Django ORM if you\'re building a Django app, SQLAlchemy for more flexibility.',
+        'moderation_score': 0.05,
+        'agent_confidence': 0.92,
+        'citations': json_dumps([
+            {'title': 'Django ORM Documentation', 'source': 'docs.djangoproject.com'},
+            {'title': 'SQLAlchemy Tutorial', 'source': 'sqlalchemy.org'}
+        ]),
+        'processing_time': 3.1
+    },
+    {
+        'subreddit': 'python',
+        'post_id': 'sample_003',
+        'post_title': 'Understanding Python decorators',
+        'post_content': 'Can someone explain Python decorators in simple terms? I keep seeing @ symbols in code and don\'t understand what they do.',
+        'post_author': 'decorator_confused',
+        'post_url': 'https://reddit.com/r/python/sample_003',
+        'status': 'approved',
+        'drafted_reply': 'Python decorators are a way to modify or extend functions without changing their code directly.\n\nThink of it like wrapping a gift:\n- The function is the gift\n- The decorator is the wrapping paper\n- The @ symbol applies the wrapping\n\nHere\'s a simple example:\n\n```python\n@my_decorator\ndef say_hello():\n    print("Hello!")\n```\n\nThe decorator can add functionality before, after, or around the original function.',
+        'final_reply': 'Python decorators are a way to modify or extend functions without changing their code directly.\n\nThink of it like wrapping a gift:\n- The function is the gift\n- The decorator is the wrapping paper\n- The @ symbol applies the wrapping\n\nHere\'s a simple example:\n\n```python\n@my_decorator\ndef say_hello():\n    print("Hello!")\n```\n\nThe decorator can add functionality before, after, or around the original function.',
+        'moderation_score': 0.02,
+        'agent_confidence': 0.78,
+        'citations': json_dumps([
+            {'title': 'Python Decorators Guide', 'source': 'realpython.com'},
+            {'title': 'Decorator Documentation', 'source': 'docs.python.org'}
+        ]),
+        'processing_time': 1.8
+    }
+)
+
+def _format_duration(seconds: float) -> str:
+    """Format elapsed seconds as HH:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
 
 class AgentIntegration:
     """
@@ -30,13 +115,35 @@ class AgentIntegration:
         self.db = DatabaseManager()
         self.agent_status = "idle"
         self.current_runs = {}
+        # Secondary index of run IDs by status so lookups don't scan run history
+        self._runs_by_status = defaultdict(set)
+        self._active_run_ids = set()
+        # len(_active_run_ids), kept by _set_status so health polls read it in O(1)
+        self._active_count = 0
+        # Guards current_runs and its indexes; worker threads and UI reads share them
+        self._runs_lock = threading.RLock()
+        # LRU of post_ids already stored, checked before querying the DB (guarded by _runs_lock)
+        self._seen_ids = OrderedDict()
+        # Monitoring runs are coroutines on one event-loop thread (started on first use);
+        # their agent calls and single requests run on this bounded pool.
+        self._loop = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv("AGENT_WORKERS", "8")),
+            thread_name_prefix="agent"
+        )
+        atexit.register(self._pool.shutdown, wait=False)
+        # Short-lived cache for health/metrics reads hit on every Streamlit rerun
+        self._health_cache = {}
+        self._health_cache_lock = threading.RLock()
+        # Wall-clock times are what callers see; elapsed-time math uses the monotonic clock
         self.last_heartbeat = datetime.now()
+        self._last_heartbeat_mono = time.monotonic()
         self.dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
         
         # Optionally seed demo data only if DB is empty and env allows
         try:
             seed_demo = os.getenv("SEED_DEMO_DATA", "true").lower() == "true"
-            if seed_demo and len(self.db.get_requests_by_filter({"limit": 1})) == 0:
+            if seed_demo and self.db.count() == 0:
                 self._initialize_demo_data()
         except Exception:
             pass
@@ -44,72 +151,13 @@ class AgentIntegration:
     def _initialize_demo_data(self):
         """Initialize some demo data for the UI to display (optional)"""
         
-        # Create some sample requests for demonstration
-        sample_requests = [
-            {
-                'id': str(uuid.uuid4()),
-                'subreddit': 'learnpython',
-                'post_id': 'sample_001',
-                'post_title': 'How do I install Python on Windows?',
-                'post_content': 'I\'m new to programming and want to install Python on my Windows 10 computer. Can someone guide me through the process?',
-                'post_author': 'pythonbeginner123',
-                'post_url': 'https://reddit.com/r/learnpython/sample_001',
-                'status': 'pending',
-                'drafted_reply': 'To install Python on Windows, you can follow these steps:\n\n1. Go to python.org\n2. Download the latest Python installer\n3. Run the installer and check "Add Python to PATH"\n4. Verify installation by opening Command Prompt and typing `python --version`\n\nThis should get you started with Python development on Windows!',
-                'moderation_score': 0.1,
-                'agent_confidence': 0.85,
-                'citations': json.dumps([
-                    {'title': 'Python Installation Guide', 'source': 'python.org'},
-                    {'title': 'Windows Setup Documentation', 'source': 'docs.python.org'}
-                ]),
-                'processing_time': 2.3
-            },
-            {
-                'id': str(uuid.uuid4()),
-                'subreddit': 'django',
-                'post_id': 'sample_002',
-                'post_title': 'Django models vs SQLAlchemy - which is better?',
-                'post_content': 'I\'m starting a new web project and wondering whether to use Django ORM or SQLAlchemy. What are the pros and cons?',
-                'post_author': 'webdev_curious',
-                'post_url': 'https://reddit.com/r/django/sample_002',
-                'status': 'pending',
-                'drafted_reply': 'Both Django ORM and SQLAlchemy are excellent choices, but they serve different purposes:\n\n**Django ORM:**\n- Integrated with Django framework\n- Convention over configuration\n- Great for rapid development\n- Active Record pattern\n\n**SQLAlchemy:**\n- Framework agnostic\n- More flexible and powerful\n- Data Mapper pattern\n- Better for complex queries\n\nChoose Django ORM if you\'re building a Django app, SQLAlchemy for more flexibility.',
-                'moderation_score': 0.05,
-                'agent_confidence': 0.92,
-                'citations': json.dumps([
-                    {'title': 'Django ORM Documentation', 'source': 'docs.djangoproject.com'},
-                    {'title': 'SQLAlchemy Tutorial', 'source': 'sqlalchemy.org'}
-                ]),
-                'processing_time': 3.1
-            },
-            {
-                'id': str(uuid.uuid4()),
-                'subreddit': 'python',
-                'post_id': 'sample_003',
-                'post_title': 'Understanding Python decorators',
-                'post_content': 'Can someone explain Python decorators in simple terms? I keep seeing @ symbols in code and don\'t understand what they do.',
-                'post_author': 'decorator_confused',
-                'post_url': 'https://reddit.com/r/python/sample_003',
-                'status': 'approved',
-                'drafted_reply': 'Python decorators are a way to modify or extend functions without changing their code directly.\n\nThink of it like wrapping a gift:\n- The function is the gift\n- The decorator is the wrapping paper\n- The @ symbol applies the wrapping\n\nHere\'s a simple example:\n\n```python\n@my_decorator\ndef say_hello():\n    print("Hello!")\n```\n\nThe decorator can add functionality before, after, or around the original function.',
-                'final_reply': 'Python decorators are a way to modify or extend functions without changing their code directly.\n\nThink of it like wrapping a gift:\n- The function is the gift\n- The decorator is the wrapping paper\n- The @ symbol applies the wrapping\n\nHere\'s a simple example:\n\n```python\n@my_decorator\ndef say_hello():\n    print("Hello!")\n```\n\nThe decorator can add functionality before, after, or around the original function.',
-                'moderation_score': 0.02,
-                'agent_confidence': 0.78,
-                'citations': json.dumps([
-                    {'title': 'Python Decorators Guide', 'source': 'realpython.com'},
-                    {'title': 'Decorator Documentation', 'source': 'docs.python.org'}
-                ]),
-                'processing_time': 1.8
-            }
-        ]
-        
-        # Add sample requests to database
-        for request in sample_requests:
-            try:
-                self.db.add_request(request)
-            except Exception as e:
-                # Request might already exist, that's okay for demo
-                pass
+        # One transaction for all seed rows; rows that already exist are skipped
+        try:
+            self.db.add_requests_bulk(
+                [{**template, 'id': str(uuid.uuid4())} for template in _DEMO_REQUESTS_TEMPLATE]
+            )
+        except Exception:
+            pass
     
     def start_agent_monitoring(self, subreddit: str, keywords: str = "") -> str:
         """
@@ -118,85 +166,188 @@ class AgentIntegration:
         """
         
         run_id = str(uuid.uuid4())
-        self.current_runs[run_id] = {
+        self._add_run(run_id, {
             'type': 'monitoring',
-            'status': 'running',
             'subreddit': subreddit,
             'keywords': keywords,
             'start_time': datetime.now(),
             'posts_found': 0,
             'replies_drafted': 0,
             'stop': False
-        }
-        
-        thread = threading.Thread(target=self._monitoring_loop, args=(run_id,), daemon=True)
-        thread.start()
+        })
+        self._update_run(run_id, future=asyncio.run_coroutine_threadsafe(
+            self._monitor_coro(run_id), self._get_loop()
+        ))
         
         return run_id
     
-    def _monitoring_loop(self, run_id: str):
-        """Background monitoring loop that periodically calls the agent and persists results"""
+    async def _monitor_coro(self, run_id: str):
+        """Monitoring coroutine that periodically calls the agent and persists results"""
+        loop = asyncio.get_running_loop()
         try:
             cfg_interval = int(os.getenv("SCAN_INTERVAL_SECONDS", "120"))
+            self._update_run(run_id, scan_interval=cfg_interval)
             while True:
-                run = self.current_runs.get(run_id)
+                self._update_run(run_id, heartbeat=time.monotonic())
+                run = self._get_run_snapshot(run_id)
                 if not run or run.get('stop'):
                     break
                 subreddit = run.get('subreddit')
                 keywords = run.get('keywords') or "open source help"
-                self.current_runs[run_id]['status'] = 'processing'
+                self._set_status(run_id, 'processing')
                 try:
                     from apps.agent.main import run_oss_agent
-                    result = run_oss_agent(query=keywords, subreddit=subreddit)
-                    posts = result.get('reddit_posts') or []
-                    drafted_reply = result.get('drafted_reply') or ''
-                    moderation = result.get('moderation_report') or {}
-
-                    created = 0
-                    for post in posts:
-                        post_id = post.get('id')
-                        if self.db.request_exists_by_post_id(post_id):
-                            continue
-                        self._persist_request_from_agent(post, drafted_reply, moderation)
-                        created += 1
-                    self.current_runs[run_id]['posts_found'] += len(posts)
-                    self.current_runs[run_id]['replies_drafted'] += created
+                    # Blocking agent and DB work runs on the pool so the loop stays free
+                    result = await loop.run_in_executor(
+                        self._pool, functools.partial(run_oss_agent, query=keywords, subreddit=subreddit)
+                    )
+                    await loop.run_in_executor(self._pool, self._store_scan_result, run_id, result)
                 except Exception as agent_err:
-                    self.current_runs[run_id]['error'] = str(agent_err)
-                    self.current_runs[run_id]['status'] = 'warning'
+                    with self._runs_lock:
+                        self._update_run(run_id, error=str(agent_err))
+                        self._set_status(run_id, 'warning')
                 
-                # sleep until next polling
-                for _ in range(cfg_interval):
-                    time.sleep(1)
-                    if self.current_runs.get(run_id, {}).get('stop'):
-                        break
-            self.current_runs[run_id]['status'] = 'completed'
-            self.current_runs[run_id]['end_time'] = datetime.now()
+                # sleep until next polling; stop_agent_run cancels the task to wake it early
+                await asyncio.sleep(cfg_interval)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            if run_id in self.current_runs:
-                self.current_runs[run_id]['status'] = 'failed'
-                self.current_runs[run_id]['error'] = str(e)
+            with self._runs_lock:
+                self._set_status(run_id, 'failed')
+                self._update_run(run_id, error=str(e))
+            return
+        with self._runs_lock:
+            self._set_status(run_id, 'completed')
+            self._update_run(run_id, end_time=datetime.now())
+    
+    def _store_scan_result(self, run_id: str, result: Dict[str, Any]):
+        """Persist new posts from one monitoring scan and update the run counters"""
+        posts = result.get('reddit_posts') or []
+        drafted_reply = result.get('drafted_reply') or ''
+        moderation = result.get('moderation_report') or {}
+
+        # Skip post_ids seen recently, then one lookup and one transaction for the rest
+        with self._runs_lock:
+            unseen = [p for p in posts if p.get('id') not in self._seen_ids]
+        existing = self.db.filter_existing_post_ids([p.get('id') for p in unseen])
+        new_posts = {}
+        for post in unseen:
+            post_id = post.get('id')
+            if post_id not in existing and post_id not in new_posts:
+                new_posts[post_id] = post
+        moderation_fields = self._moderation_fields(moderation)
+        rows = [
+            self._build_request_row(p, drafted_reply, moderation, moderation_fields)
+            for p in new_posts.values()
+        ]
+        self.db.add_requests_bulk(rows)
+        self._mark_seen(existing.union(new_posts))
+        self._increment_run(run_id, posts_found=len(posts), replies_drafted=len(rows))
+    
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the shared monitoring event loop, starting its thread on first use"""
+        with self._runs_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="agent-monitor-loop", daemon=True
+                ).start()
+            return self._loop
+    
+    def _mark_seen(self, post_ids):
+        """Record stored post_ids in the seen-LRU, evicting the oldest past _SEEN_POST_IDS_MAX"""
+        with self._runs_lock:
+            for post_id in post_ids:
+                if not post_id:
+                    continue
+                self._seen_ids[post_id] = None
+                self._seen_ids.move_to_end(post_id)
+            while len(self._seen_ids) > _SEEN_POST_IDS_MAX:
+                self._seen_ids.popitem(last=False)
+    
+    def _add_run(self, run_id: str, run: Dict[str, Any]):
+        """Register a new run in the 'running' state"""
+        with self._runs_lock:
+            run['heartbeat'] = time.monotonic()
+            self.current_runs[run_id] = run
+            self._set_status(run_id, 'running')
+            self._evict_finished_runs()
+    
+    def _update_run(self, run_id: str, **fields):
+        """Atomically set fields on a run (no-op if the run is gone)"""
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            if run is not None:
+                run.update(fields)
+    
+    def _increment_run(self, run_id: str, **deltas):
+        """Atomically add deltas to a run's counters"""
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            if run is not None:
+                for key, delta in deltas.items():
+                    run[key] = run.get(key, 0) + delta
+    
+    def _get_run_snapshot(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Return a shallow copy of a run that is safe to read outside the lock"""
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            return dict(run) if run is not None else None
+    
+    def _set_status(self, run_id: str, status: str):
+        """Set a run's status and keep the status index in sync"""
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            if run is None:
+                return
+            self._runs_by_status[run.get('status')].discard(run_id)
+            run['status'] = status
+            self._runs_by_status[status].add(run_id)
+            was_active = run_id in self._active_run_ids
+            if status in ACTIVE_RUN_STATUSES:
+                self._active_run_ids.add(run_id)
+                self._active_count += not was_active
+            elif was_active:
+                self._active_run_ids.discard(run_id)
+                self._active_count -= 1
+            if status in _FINISHED_RUN_STATUSES:
+                run['finished_mono'] = time.monotonic()
+    
+    def _evict_finished_runs(self, max_age: float = _RUN_RETENTION_SECONDS):
+        """Drop finished runs older than max_age seconds to bound memory"""
+        cutoff = time.monotonic() - max_age
+        with self._runs_lock:
+            for status in _FINISHED_RUN_STATUSES:
+                for run_id in list(self._runs_by_status[status]):
+                    run = self.current_runs.get(run_id)
+                    if run is None or run.get('finished_mono', cutoff) <= cutoff:
+                        self._runs_by_status[status].discard(run_id)
+                        self.current_runs.pop(run_id, None)
     
     def get_run_status(self, run_id: str) -> Optional[Dict[str, Any]]:
         """Get the status of a specific agent run"""
-        return self.current_runs.get(run_id)
+        return self._get_run_snapshot(run_id)
     
     def get_all_active_runs(self) -> List[Dict[str, Any]]:
         """Get all currently active agent runs"""
-        active_runs = []
-        for run_id, run_data in self.current_runs.items():
-            if run_data['status'] in ['running', 'processing']:
-                run_data['id'] = run_id
-                active_runs.append(run_data)
-        return active_runs
+        with self._runs_lock:
+            return [
+                {**self.current_runs[run_id], 'id': run_id}
+                for run_id in self._active_run_ids
+                if run_id in self.current_runs
+            ]
     
     def stop_agent_run(self, run_id: str) -> bool:
         """Stop a specific agent run"""
-        if run_id in self.current_runs:
-            self.current_runs[run_id]['stop'] = True
-            self.current_runs[run_id]['status'] = 'stopped'
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            if run is None:
+                return False
+            run['stop'] = True
+            if run.get('future'):
+                run['future'].cancel()
+            self._set_status(run_id, 'stopped')
             return True
-        return False
     
     def process_single_request(self, query: str, subreddit: str, submission_id: Optional[str] = None) -> str:
         """
@@ -204,35 +355,55 @@ class AgentIntegration:
         Returns a run ID for tracking.
         """
         
+        run_id = self._add_single_run(query, subreddit, submission_id)
+        self._update_run(run_id, future=self._pool.submit(self._run_single_request, run_id))
+        
+        return run_id
+    
+    def process_many(self, jobs: List[Tuple[str, str]]) -> List[str]:
+        """
+        Process several (query, subreddit) requests concurrently on the worker pool.
+        Returns one run ID per job, in order.
+        """
+        run_ids = [self._add_single_run(query, subreddit) for query, subreddit in jobs]
+        if run_ids:
+            asyncio.run_coroutine_threadsafe(self._process_many_async(run_ids), self._get_loop())
+        return run_ids
+    
+    async def _process_many_async(self, run_ids: List[str]):
+        """Run queued single requests together; each run records its own outcome"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._pool, self._run_single_request, run_id) for run_id in run_ids),
+            return_exceptions=True
+        )
+    
+    def _add_single_run(self, query: str, subreddit: str, submission_id: Optional[str] = None) -> str:
+        """Register a single-request run and return its ID"""
         run_id = str(uuid.uuid4())
-        self.current_runs[run_id] = {
+        self._add_run(run_id, {
             'type': 'single_request',
-            'status': 'running',
             'query': query,
             'subreddit': subreddit,
             'submission_id': submission_id,
             'start_time': datetime.now()
-        }
-        
-        thread = threading.Thread(target=self._run_single_request, args=(run_id,), daemon=True)
-        thread.start()
-        
+        })
         return run_id
     
     def _run_single_request(self, run_id: str):
         """Execute a single agent call and persist result"""
         try:
-            run = self.current_runs.get(run_id)
-            if not run:
+            run = self._get_run_snapshot(run_id)
+            if not run or run.get('stop'):
                 return
             query = run.get('query')
             subreddit = run.get('subreddit')
 
-            self.current_runs[run_id]['status'] = 'searching'
+            self._set_status(run_id, 'searching')
             from apps.agent.main import run_oss_agent
             result = run_oss_agent(query=query, subreddit=subreddit)
 
-            self.current_runs[run_id]['status'] = 'moderating'
+            self._set_status(run_id, 'moderating')
             posts = result.get('reddit_posts') or []
             drafted_reply = result.get('drafted_reply') or ''
             moderation = result.get('moderation_report') or {}
@@ -249,38 +420,80 @@ class AgentIntegration:
                     'url': f'https://reddit.com/r/{subreddit}/'
                 }, drafted_reply, moderation)
 
-            self.current_runs[run_id]['status'] = 'completed'
-            self.current_runs[run_id]['end_time'] = datetime.now()
+            with self._runs_lock:
+                self._set_status(run_id, 'completed')
+                self._update_run(run_id, end_time=datetime.now())
         except Exception as e:
-            self.current_runs[run_id]['status'] = 'failed'
-            self.current_runs[run_id]['error'] = str(e)
+            with self._runs_lock:
+                self._set_status(run_id, 'failed')
+                self._update_run(run_id, error=str(e))
+    
+    def _cached(self, key: str, compute):
+        """Return compute() memoized under key for HEALTH_CACHE_TTL seconds"""
+        now = time.monotonic()
+        with self._health_cache_lock:
+            entry = self._health_cache.get(key)
+            if entry is None or entry[0] <= now:
+                entry = (now + HEALTH_CACHE_TTL, compute())
+                self._health_cache[key] = entry
+            return dict(entry[1])
+    
+    def _invalidate_health_cache(self):
+        """Drop cached health/metrics so the next read reflects a DB write"""
+        with self._health_cache_lock:
+            self._health_cache.clear()
     
     def get_agent_health(self) -> Dict[str, Any]:
-        """Get current agent health status"""
+        """Get current agent health status (cached for HEALTH_CACHE_TTL seconds)"""
+        return self._cached('agent_health', self._compute_agent_health)
+    
+    def is_run_alive(self, run_id: str, max_silence: float = _RUN_HEARTBEAT_TIMEOUT) -> bool:
+        """
+        Whether a run has heartbeated within max_silence seconds of its expected next beat.
         
+        Only monitoring runs heartbeat; a single request is one blocking agent call, so it
+        counts as alive for as long as it is active.
+        """
+        with self._runs_lock:
+            run = self.current_runs.get(run_id)
+            if run is None:
+                return False
+            if run.get('type') != 'monitoring':
+                return run_id in self._active_run_ids
+            silence = time.monotonic() - run.get('heartbeat', 0)
+            return silence < max_silence + run.get('scan_interval', 0)
+    
+    def _compute_agent_health(self) -> Dict[str, Any]:
         # Simulate system health checks (lightweight without psutil here)
+        with self._runs_lock:
+            stalled_runs = sum(1 for run_id in self._active_run_ids if not self.is_run_alive(run_id))
         return {
-            'status': 'healthy',
-            'uptime': str(datetime.now() - self.last_heartbeat).split('.')[0],
+            'status': 'warning' if stalled_runs else 'healthy',
+            'uptime': _format_duration(time.monotonic() - self._last_heartbeat_mono),
             'last_heartbeat': self.last_heartbeat,
             'memory_usage': 50,
             'cpu_usage': 15,
             'reddit_api_status': 'unknown',
             'rag_system_status': 'ready',
             'database_status': 'healthy',
-            'active_runs': len(self.get_all_active_runs()),
-            'total_requests_today': len(self.db.get_requests_by_filter({'limit': 1000})),
-            'pending_approvals': len(self.db.get_pending_requests()),
+            'active_runs': self._active_count,
+            'stalled_runs': stalled_runs,
+            'total_requests_today': self.db.count(),
+            'pending_approvals': self.db.count(STATUS_PENDING),
             'dry_run': self.dry_run,
         }
     
     def update_heartbeat(self):
         """Update the agent heartbeat timestamp"""
         self.last_heartbeat = datetime.now()
+        self._last_heartbeat_mono = time.monotonic()
     
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get detailed system performance metrics (mocked)"""
-        
+        """Get detailed system performance metrics (mocked, cached for HEALTH_CACHE_TTL seconds)"""
+        return self._cached('system_metrics', self._compute_system_metrics)
+    
+    def _compute_system_metrics(self) -> Dict[str, Any]:
+        status_counts = self.db.get_status_counts()
         return {
             'response_times': {
                 'avg_24h': 3.2,
@@ -299,10 +512,10 @@ class AgentIntegration:
                 'rate_limit_remaining': 90
             },
             'database_stats': {
-                'total_requests': len(self.db.get_requests_by_filter({'limit': 10000})),
-                'total_approved': len([r for r in self.db.get_requests_by_filter({'limit': 10000}) if r['status']=='approved']),
-                'total_rejected': len([r for r in self.db.get_requests_by_filter({'limit': 10000}) if r['status']=='rejected']),
-                'pending': len(self.db.get_pending_requests())
+                'total_requests': sum(status_counts.values()),
+                'total_approved': status_counts.get('approved', 0),
+                'total_rejected': status_counts.get('rejected', 0),
+                'pending': status_counts.get(STATUS_PENDING, 0)
             }
         }
     
@@ -334,31 +547,37 @@ class AgentIntegration:
 
     def _persist_request_from_agent(self, post: Dict[str, Any], drafted_reply: str, moderation: Dict[str, Any]):
         """Persist a pending request derived from agent outputs"""
-        request = {
+        self.db.add_request(self._build_request_row(post, drafted_reply, moderation))
+
+    @staticmethod
+    def _moderation_fields(moderation: Dict[str, Any]) -> Dict[str, Any]:
+        """Request fields derived from the moderation report; shared by every post in a scan"""
+        if not isinstance(moderation, dict):
+            return {'moderation_score': 0.0, 'agent_confidence': 0.75, 'moderation_flags': []}
+        return {
+            'moderation_score': 1.0 - float(moderation.get('safety_score', 0.0)),
+            'agent_confidence': float(moderation.get('confidence', 0.75)),
+            # Always pass a list; DatabaseManager.add_request will JSON-encode it
+            'moderation_flags': moderation.get('flags') or [],
+        }
+
+    def _build_request_row(self, post: Dict[str, Any], drafted_reply: str, moderation: Dict[str, Any],
+                           moderation_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a pending request dict from agent outputs"""
+        post_id, title, body, author, url, subreddit = map(post.get, _POST_FIELDS)
+        return {
             'id': str(uuid.uuid4()),
-            'subreddit': post.get('subreddit') or 'unknown',
-            'post_id': post.get('id'),
-            'post_title': post.get('title') or 'Question',
-            'post_content': post.get('selftext') or '',
-            'post_author': post.get('author') or 'unknown',
-            'post_url': post.get('url') or '',
-            'status': 'pending',
+            'subreddit': subreddit or 'unknown',
+            'post_id': post_id,
+            'post_title': title or 'Question',
+            'post_content': body or '',
+            'post_author': author or 'unknown',
+            'post_url': url or '',
+            'status': STATUS_PENDING,
             'drafted_reply': drafted_reply,
-            'moderation_score': (1.0 - float(moderation.get('safety_score', 0.0))) if isinstance(moderation, dict) else 0.0,
-            'agent_confidence': float(moderation.get('confidence', 0.75)) if isinstance(moderation, dict) else 0.75,
-            'citations': []
+            'citations': _EMPTY_CITATIONS,
+            **(moderation_fields or self._moderation_fields(moderation)),
         }
-        try:
-            request['citations'] = json.dumps(request['citations'])
-        except Exception:
-            request['citations'] = json.dumps([])
-        # moderation_flags must be JSON-serializable list
-        flags = []
-        if isinstance(moderation, dict) and moderation.get('flags'):
-            flags = moderation['flags']
-        # Always pass list; DatabaseManager.add_request will JSON-encode it
-        request['moderation_flags'] = flags
-        self.db.add_request(request)
 
     def approve_request(
         self,
@@ -378,6 +597,7 @@ class AgentIntegration:
 
         # Update DB with final reply and approved status
         self.db.update_request_status(request_id, "approved", final_reply)
+        self._invalidate_health_cache()
         self.db.log_user_action(
             "approve",
             request_id,
@@ -407,37 +627,68 @@ class AgentIntegration:
         if not req:
             return {"status": "error", "message": "Request not found"}
         self.db.update_request_status(request_id, 'rejected', human_feedback=reason)
+        self._invalidate_health_cache()
         self.db.log_user_action('reject', request_id, 'admin', {'reason': reason})
         return {"status": "success", "message": "Request rejected"}
 
+# Shared keep-alive session for the local Ollama server so each draft reuses a pooled
+# connection instead of paying a fresh TCP handshake
+_ollama_session = requests.Session()
+_ollama_session.mount(
+    "http://",
+    HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2))
+)
+atexit.register(_ollama_session.close)
+
 def generate_draft_with_ollama(query: str, model: str = "gemma3"):
     """Generate draft reply using Ollama running locally"""
     try:
-        resp = requests.post(
+        # /api/generate streams NDJSON: one {"response": ..., "done": ...} object per line
+        with _ollama_session.post(
             "http://localhost:11434/api/generate",
-            json={"model": model, "prompt": f"Answer this Reddit question:\n\n{query}"}
-        )
-        data = resp.json()
-        return data.get("response", "").strip()
+            json={"model": model, "prompt": f"Answer this Reddit question:\n\n{query}", "stream": True},
+            stream=True,
+            timeout=(2, 120)
+        ) as resp:
+            parts = []
+            for line in resp.iter_lines():
+                if not line:
+                    continue
+                chunk = json_loads(line)
+                parts.append(chunk.get("response", ""))
+                if chunk.get("done"):
+                    break
+        return "".join(parts).strip()
     except Exception as e:
         return f"[Error generating draft: {e}]"
 
-from groq import Groq
+# Groq client is created on first use so importing this module never needs the SDK or a key
+_groq_lock = threading.Lock()
+_groq_client = None
 
-# Initialize the client once
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-if(groq_client is None):
-    raise ValueError("GROQ_API_KEY environment variable is not set or invalid.")
+def get_groq_client():
+    """Return the shared Groq client, creating it on first call"""
+    global _groq_client
+    if _groq_client is None:
+        with _groq_lock:
+            if _groq_client is None:
+                key = os.getenv("GROQ_API_KEY")
+                if not key:
+                    raise RuntimeError("GROQ_API_KEY environment variable is not set.")
+                from groq import Groq
+                _groq_client = Groq(api_key=key)
+    return _groq_client
 
-def generate_draft_with_groq(query_text: str) -> str:
+def generate_draft_with_groq(query_text: str, stream: bool = False) -> str:
     """
-    Generate a draft reply using Groq Python client (streaming version)
+    Generate a draft reply using Groq Python client.
+    stream=True collects the reply from incremental chunks; the default makes one request.
     """
     if not query_text:
         return ""
 
     try:
-        completion = groq_client.chat.completions.create(
+        completion = get_groq_client().chat.completions.create(
             model="llama-3.1-8b-instant",
             messages=[
                 {"role": "system", "content": "You are a helpful AI agent drafting replies.answers must be accurate and safe and consise.Be very much consise."},
@@ -446,18 +697,26 @@ def generate_draft_with_groq(query_text: str) -> str:
             temperature=0.6,
             max_completion_tokens=100,
             top_p=1,
-            stream=True  # enable streaming chunks
+            stream=stream
         )
 
-        # Collect streamed content
-        draft_text = ""
+        if not stream:
+            return (completion.choices[0].message.content or "").strip()
+
+        # Collect streamed content; echo tokens to stdout only when GROQ_DEBUG=1
+        parts = []
+        debug = os.getenv("GROQ_DEBUG") == "1"
         for chunk in completion:
             delta = chunk.choices[0].delta
-            if delta and hasattr(delta, "content") and delta.content:
-                draft_text += delta.content
-                print(delta.content, end="")  # optional debug streaming
-        print()  # newline after stream
-        return draft_text.strip()
+            content = getattr(delta, "content", None)
+            if content:
+                parts.append(content)
+                if debug:
+                    sys.stdout.write(content)
+        if debug:
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        return "".join(parts).strip()
 
     except Exception as e:
         print(f"⚠️ Groq API error: {e}")
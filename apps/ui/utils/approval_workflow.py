@@ -5,38 +5,107 @@ import sys
 import logging
 import uuid
 import re
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dotenv import load_dotenv
 
-# Add project root to path for imports
-project_root = Path(__file__).parent.parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+# Add project root to path for imports, unless an entry point already made tools importable
+if 'tools' not in sys.modules:
+    project_root = str(Path(__file__).parent.parent.parent.parent)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 try:
-    from tools.reddit_tool import RedditTool
+    from tools.reddit_tool import RedditTool, RedditCreds
     from tools.rag_tool import RAGTool
-    from tools.moderation_tools import analyze_text
+    from tools.moderation_tools import analyze_text_result
 except ImportError as e:
-    logging.warning(f"Could not import tools: {e}")
+    logging.warning("Could not import tools: %s", e)
     RedditTool = None
+    RedditCreds = None
     RAGTool = None
-    analyze_text = None
+    analyze_text_result = None
 
 try:
-    from apps.ui.utils.database import DatabaseManager
+    from apps.ui.utils.database import DatabaseManager, STATUS_PENDING, STATUS_POSTING
 except ImportError:
     DatabaseManager = None
+    STATUS_PENDING = 'pending'
+    STATUS_POSTING = 'posting'
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+# Seconds that get_request_stats results are reused between dashboard refreshes
+STATS_CACHE_TTL = 5.0
+# Listed requests kept in memory for the approve/reject that usually follows
+REQUEST_CACHE_SIZE = 256
+# Seconds a cached request's draft is trusted before approve/reject re-reads it
+REQUEST_CACHE_TTL = 10.0
+# Seconds during which a repeated per-post failure message is logged only once
+LOG_REPEAT_WINDOW = 60.0
+
+class _LogLimiter:
+    """
+    Log a message at most once per window for each key, so an outage that fails every
+    post (rate limits, network down) logs one line per window instead of one per post.
+    The next message logged for a key reports how many were dropped.
+    """
+    
+    def __init__(self, log: logging.Logger, window: float = LOG_REPEAT_WINDOW):
+        self._log = log
+        self._window = window
+        # key -> (monotonic time last logged, messages dropped since)
+        self._seen: Dict[Any, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+    
+    def _log_limited(self, level: int, key, msg: str, *args):
+        now = time.monotonic()
+        with self._lock:
+            last, dropped = self._seen.get(key, (None, 0))
+            if last is not None and now - last < self._window:
+                self._seen[key] = (last, dropped + 1)
+                return
+            self._seen[key] = (now, 0)
+        if dropped:
+            msg += " (%d similar messages suppressed)"
+            args += (dropped,)
+        self._log.log(level, msg, *args)
+    
+    def warning(self, key, msg: str, *args):
+        self._log_limited(logging.WARNING, key, msg, *args)
+    
+    def error(self, key, msg: str, *args):
+        self._log_limited(logging.ERROR, key, msg, *args)
+
+_limited = _LogLimiter(logger)
+
+# Patterns used by markdown_to_plain_text, compiled once at import
+_RE_CODEBLOCK = re.compile(r'```[\s\S]*?```')
+_RE_INLINE_CODE = re.compile(r'`([^`]+)`')
+_RE_HEADER = re.compile(r'^#{1,6}\s*(.+)$', re.MULTILINE)
+# **bold**, *italic*, __bold__ and _italic_ in one pass; the match keeps whichever group hit.
+# A '* ' list marker never opens italics, so '* **item**' bullets survive the pass.
+_RE_EMPHASIS = re.compile(r'\*\*([^*]+)\*\*|\*(?!\s)([^*]+)\*|__([^_]+)__|_([^_]+)_')
+_RE_LINK = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_RE_LIST_ITEM = re.compile(r'^[\s]*(?:[-*+]|\d+\.)\s+', re.MULTILINE)
+# Leftover markdown characters, deleted with str.translate
+_ARTIFACTS_TABLE = str.maketrans('', '', '*_~`')
+_RE_BLANK_LINES = re.compile(r'\n\s*\n\s*\n+')
+# Characters that can start a markdown construct stripped below; text without any skips those passes
+_MD_CHARS = frozenset('*_`#[-+~')
+
+def _emphasis_text(match: re.Match) -> str:
+    """Replacement for _RE_EMPHASIS: the text inside whichever marker matched"""
+    return next(group for group in match.groups() if group is not None)
+
 def markdown_to_plain_text(text: str) -> str:
     """
     Convert markdown text to plain text suitable for Reddit posting.
@@ -51,39 +120,61 @@ def markdown_to_plain_text(text: str) -> str:
     if not text:
         return text
     
-    # Remove code blocks (triple backticks)
-    text = re.sub(r'```[\s\S]*?```', lambda m: m.group(0).replace('```', '').strip(), text)
+    # Plain prose: only numbered lists and whitespace can change
+    if _MD_CHARS.isdisjoint(text):
+        return _tidy_whitespace(_RE_LIST_ITEM.sub('• ', text))
     
-    # Remove inline code (single backticks)
-    text = re.sub(r'`([^`]+)`', r'\1', text)
+    # Each pass below only runs when its marker occurs; the substring checks are
+    # far cheaper than letting the regex scan a draft that cannot match.
+    if '`' in text:
+        # Remove code blocks (triple backticks)
+        if '```' in text:
+            text = _RE_CODEBLOCK.sub(lambda m: m.group(0).replace('```', '').strip(), text)
+        
+        # Remove inline code (single backticks)
+        text = _RE_INLINE_CODE.sub(r'\1', text)
     
     # Convert headers to plain text with emphasis
-    text = re.sub(r'^#{1,6}\s*(.+)$', r'\1\n\n', text, flags=re.MULTILINE)
+    if '#' in text:
+        text = _RE_HEADER.sub(r'\1\n\n', text)
     
     # Remove bold and italic formatting but keep the text
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **bold**
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)      # *italic*
-    text = re.sub(r'__([^_]+)__', r'\1', text)      # __bold__
-    text = re.sub(r'_([^_]+)_', r'\1', text)        # _italic_
+    if '*' in text or '_' in text:
+        text = _RE_EMPHASIS.sub(_emphasis_text, text)
     
     # Convert links [text](url) to "text (url)"
-    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\1 (\2)', text)
-    
-    # Convert bullet points
-    text = re.sub(r'^[\s]*[-*+]\s+', '• ', text, flags=re.MULTILINE)
+    if '](' in text:
+        text = _RE_LINK.sub(r'\1 (\2)', text)
     
-    # Convert numbered lists
-    text = re.sub(r'^[\s]*\d+\.\s+', '• ', text, flags=re.MULTILINE)
+    # Convert bullet points and numbered lists
+    text = _RE_LIST_ITEM.sub('• ', text)
     
     # Remove remaining markdown artifacts
-    text = re.sub(r'[\*_~`]', '', text)
-    
-    # Clean up excessive whitespace
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-    text = re.sub(r'^\s+|\s+$', '', text, flags=re.MULTILINE)
+    text = text.translate(_ARTIFACTS_TABLE)
     
+    return _tidy_whitespace(text)
+
+def _tidy_whitespace(text: str) -> str:
+    """Collapse runs of blank lines and trim every line"""
+    text = _RE_BLANK_LINES.sub('\n\n', text)
+    text = "\n".join(line.strip() for line in text.splitlines())
     return text.strip()
 
+def markdown_to_plain_text_batch(texts: List[str]) -> List[str]:
+    """
+    Convert many drafts at once, e.g. when backfilling plain_reply.
+    
+    Identical drafts are converted once and drafts without markdown take the
+    short-circuit path in markdown_to_plain_text.
+    """
+    converted = {}
+    results = []
+    for text in texts:
+        if text not in converted:
+            converted[text] = markdown_to_plain_text(text)
+        results.append(converted[text])
+    return results
+
 class ApprovalWorkflow:
     """
     Manages the complete approval workflow:
@@ -93,48 +184,164 @@ class ApprovalWorkflow:
     4. Track all actions and outcomes
     """
     
+    # Tools are shared by every instance: one praw session and one RAG index per process
+    _reddit_tool_singleton = None
+    _rag_tool_singleton = None
+    _tools_lock = threading.Lock()
+    
     def __init__(self):
         self.db = DatabaseManager() if DatabaseManager else None
-        self._reddit_tool = None
-        self._rag_tool = None
+        # (expires_at, stats) for get_request_stats; cleared when a request changes status
+        self._stats_cache = None
+        # Recently listed requests as (fetched_at, request), consumed by the next approve/reject
+        self._request_cache = OrderedDict()
+        # Guards _request_cache, which the posting workers touch alongside the UI thread
+        self._cache_lock = threading.Lock()
+        # Workers for approve_request_submit so posting doesn't block the UI thread
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="reddit-post")
+        self.reload_env()
+    
+    def reload_env(self):
+        """Read DRY_RUN and the Reddit credentials from the environment"""
+        self._dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
+        self._reddit_creds = RedditCreds.from_env() if RedditCreds else None
         
     def _get_reddit_tool(self) -> Optional[RedditTool]:
-        """Lazy initialization of Reddit tool"""
-        if self._reddit_tool is None and RedditTool:
-            try:
-                reddit_client_id = os.getenv("REDDIT_CLIENT_ID")
-                reddit_client_secret = os.getenv("REDDIT_CLIENT_SECRET") 
-                reddit_username = os.getenv("REDDIT_USERNAME")
-                reddit_password = os.getenv("REDDIT_PASSWORD")
-                
-                if all([reddit_client_id, reddit_client_secret, reddit_username, reddit_password]):
-                    self._reddit_tool = RedditTool(
-                        client_id=reddit_client_id,
-                        client_secret=reddit_client_secret,
-                        username=reddit_username,
-                        password=reddit_password,
-                        user_agent=f"oss-community-agent/1.0 (by u/{reddit_username})"
-                    )
-                    logger.info("Reddit tool initialized successfully")
-                else:
-                    logger.warning("Reddit credentials not configured")
-            except Exception as e:
-                logger.error(f"Failed to initialize Reddit tool: {e}")
+        """Lazy initialization of the shared Reddit tool"""
+        cls = type(self)
+        if cls._reddit_tool_singleton is None and RedditTool:
+            with cls._tools_lock:
+                if cls._reddit_tool_singleton is None:
+                    cls._reddit_tool_singleton = self._create_reddit_tool()
+        return cls._reddit_tool_singleton
+    
+    def _create_reddit_tool(self) -> Optional[RedditTool]:
+        """Build a RedditTool from this workflow's credentials"""
+        try:
+            creds = self._reddit_creds
+            
+            if creds and creds.complete:
+                tool = RedditTool(
+                    **asdict(creds),
+                    user_agent=f"oss-community-agent/1.0 (by u/{creds.username})"
+                )
+                logger.info("Reddit tool initialized successfully")
+                return tool
+            logger.warning("Reddit credentials not configured")
+        except Exception as e:
+            logger.error("Failed to initialize Reddit tool: %s", e)
         
-        return self._reddit_tool
+        return None
     
-    def _get_rag_tool(self) -> Optional[RAGTool]:
-        """Lazy initialization of RAG tool"""
-        if self._rag_tool is None and RAGTool:
-            try:
-                self._rag_tool = RAGTool()
-                logger.info("RAG tool initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize RAG tool: {e}")
+    def _update_status(self, **kwargs):
+        """Update a request's status and drop the cached stats"""
+        self._forget_request(kwargs.get('request_id'))
+        self.db.update_request_status(**kwargs)
+    
+    def _forget_request(self, request_id: str):
+        """Drop cached state that a status change on request_id makes stale"""
+        self._stats_cache = None
+        with self._cache_lock:
+            self._request_cache.pop(request_id, None)
+    
+    def _cache_requests(self, requests: List[Dict[str, Any]]):
+        """Remember listed requests so acting on them skips a DB lookup"""
+        fetched_at = time.monotonic()
+        with self._cache_lock:
+            for request in requests:
+                self._request_cache[request['id']] = (fetched_at, dict(request))
+                self._request_cache.move_to_end(request['id'])
+            while len(self._request_cache) > REQUEST_CACHE_SIZE:
+                self._request_cache.popitem(last=False)
+    
+    def _get_request(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Take a recently listed request from the cache, otherwise read it from the database"""
+        with self._cache_lock:
+            cached = self._request_cache.pop(request_id, None)
+        if cached is not None and time.monotonic() - cached[0] < REQUEST_CACHE_TTL:
+            return cached[1]
+        return self.db.get_request_by_id(request_id)
+    
+    @classmethod
+    def _get_rag_tool(cls) -> Optional[RAGTool]:
+        """Lazy initialization of the shared RAG tool"""
+        if cls._rag_tool_singleton is None and RAGTool:
+            with cls._tools_lock:
+                if cls._rag_tool_singleton is None:
+                    try:
+                        cls._rag_tool_singleton = RAGTool()
+                        logger.info("RAG tool initialized successfully")
+                    except Exception as e:
+                        logger.error("Failed to initialize RAG tool: %s", e)
                 
-        return self._rag_tool
+        return cls._rag_tool_singleton
     
-    def process_reddit_query(self, post_data: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _query_text(post_data: Dict[str, Any]) -> str:
+        """Text the RAG tool drafts a reply for"""
+        return f"{post_data.get('title', '')}\n\n{post_data.get('selftext', '')}"
+
+    def _draft_replies(self, query_texts: List[str]) -> List[Tuple[str, float]]:
+        """Draft replies for several queries with one batched RAG call; returns (reply, confidence) pairs"""
+        rag_tool = self._get_rag_tool()
+        if not rag_tool:
+            return [("RAG tool not available. Please configure the system properly.", 0.0)] * len(query_texts)
+        try:
+            replies = rag_tool.retrieve_and_generate_batch(query_texts)
+        except Exception as e:
+            _limited.warning(("rag", type(e)), "RAG generation failed: %s", e)
+            return [(f"Error generating response: {str(e)}", 0.0)] * len(query_texts)
+        drafts = []
+        for reply in replies:
+            if reply and len(reply.strip()) > 0:
+                drafts.append((reply, 0.8))  # High confidence for successful generation
+            else:
+                # Low confidence for empty/poor responses
+                drafts.append(("Unable to generate a comprehensive response based on available documentation.", 0.2))
+        return drafts
+
+    def process_reddit_queries(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        process_reddit_query for several posts: replies are drafted in one batch and
+        the requests with their audit entries are stored in one transaction.
+        """
+        if not posts:
+            return []
+        drafts = self._draft_replies([self._query_text(post) for post in posts])
+        if not self.db:
+            return [self.process_reddit_query(post, draft) for post, draft in zip(posts, drafts)]
+        
+        results = []
+        requests = []
+        for post, (drafted_reply, confidence) in zip(posts, drafts):
+            try:
+                request_data = self._build_request(post, drafted_reply, confidence)
+            except Exception as e:
+                _limited.error(("process", type(e)), "Error processing Reddit query: %s", e)
+                results.append(self._failed_result(str(e)))
+                continue
+            requests.append(request_data)
+            results.append(request_data)
+        
+        try:
+            inserted = set(self.db.add_requests_and_log(
+                requests,
+                action_type="draft_generated",
+                action_data=[self._draft_action_data(r) for r in requests]
+            ))
+        except Exception as e:
+            _limited.error(("database", type(e)), "Database error: %s", e)
+            return [r if r.get("error") else self._failed_result(f"Database error: {str(e)}") for r in results]
+        
+        logger.info("%d requests queued for approval", len(inserted))
+        return [
+            r if r.get("error")
+            else self._queued_result(r) if r["id"] in inserted
+            else self._failed_result(f"Duplicate post: {r['post_id']} is already queued")
+            for r in results
+        ]
+
+    def process_reddit_query(self, post_data: Dict[str, Any], draft: Optional[Tuple[str, float]] = None) -> Dict[str, Any]:
         """
         Process a Reddit query through the complete workflow:
         1. Generate draft response using RAG
@@ -143,82 +350,16 @@ class ApprovalWorkflow:
         
         Args:
             post_data: Dictionary containing Reddit post information
+            draft: (reply, confidence) drafted ahead of time, skipping the RAG call
             
         Returns:
             Dictionary with processing results and request ID
         """
-        result = {
-            "success": False,
-            "request_id": None,
-            "error": None,
-            "drafted_reply": None,
-            "moderation_flags": [],
-            "confidence": 0.0
-        }
-        
         try:
-            # Generate unique request ID
-            request_id = str(uuid.uuid4())
-            
-            # Extract query text from post
-            query_text = f"{post_data.get('title', '')}\n\n{post_data.get('selftext', '')}"
-            
             # Generate draft response using RAG
-            rag_tool = self._get_rag_tool()
-            drafted_reply = ""
-            confidence = 0.0
-            
-            if rag_tool:
-                try:
-                    drafted_reply = rag_tool.retrieve_and_generate(query_text)
-                    if drafted_reply and len(drafted_reply.strip()) > 0:
-                        confidence = 0.8  # High confidence for successful generation
-                    else:
-                        confidence = 0.2  # Low confidence for empty/poor responses
-                        drafted_reply = "Unable to generate a comprehensive response based on available documentation."
-                except Exception as e:
-                    logger.warning(f"RAG generation failed: {e}")
-                    drafted_reply = f"Error generating response: {str(e)}"
-                    confidence = 0.0
-            else:
-                drafted_reply = "RAG tool not available. Please configure the system properly."
-                confidence = 0.0
-            
-            # Moderate the drafted response
-            moderation_flags = []
-            moderation_score = 1.0  # Default to safe
-            
-            if analyze_text and drafted_reply:
-                try:
-                    moderation_result = analyze_text(drafted_reply)
-                    if isinstance(moderation_result, dict):
-                        if moderation_result.get('is_flagged', False):
-                            moderation_flags = moderation_result.get('flags', [])
-                            moderation_score = moderation_result.get('safety_score', 0.5)
-                        else:
-                            moderation_score = moderation_result.get('safety_score', 1.0)
-                except Exception as e:
-                    logger.warning(f"Moderation failed: {e}")
-                    moderation_flags.append("moderation_error")
-                    moderation_score = 0.5
+            drafted_reply, confidence = draft or self._draft_replies([self._query_text(post_data)])[0]
             
-            # Create request record
-            request_data = {
-                "id": request_id,
-                "subreddit": post_data.get('subreddit', 'unknown'),
-                "post_id": post_data.get('id'),
-                "post_title": post_data.get('title', ''),
-                "post_content": post_data.get('selftext', ''),
-                "post_author": post_data.get('author', 'unknown'),
-                "post_url": post_data.get('url', ''),
-                "status": "pending",
-                "drafted_reply": drafted_reply,
-                "moderation_score": moderation_score,
-                "moderation_flags": moderation_flags,
-                "agent_confidence": confidence,
-                "citations": [],
-                "created_at": datetime.now().isoformat()
-            }
+            request_data = self._build_request(post_data, drafted_reply, confidence)
             
             # Store in database
             if self.db:
@@ -226,37 +367,91 @@ class ApprovalWorkflow:
                     self.db.insert_request(request_data)
                     self.db.log_user_action(
                         action_type="draft_generated",
-                        request_id=request_id,
-                        action_data={
-                            "confidence": confidence,
-                            "moderation_score": moderation_score,
-                            "flags": moderation_flags
-                        }
+                        request_id=request_data["id"],
+                        action_data=self._draft_action_data(request_data)
                     )
-                    logger.info(f"Request {request_id} queued for approval")
+                    logger.info("Request %s queued for approval", request_data["id"])
                 except Exception as e:
-                    logger.error(f"Database error: {e}")
-                    result["error"] = f"Database error: {str(e)}"
-                    return result
+                    _limited.error(("database", type(e)), "Database error: %s", e)
+                    return self._failed_result(f"Database error: {str(e)}")
             else:
                 logger.warning("Database not available - request not stored")
-                result["error"] = "Database not available"
-                return result
+                return self._failed_result("Database not available")
             
-            # Update result
-            result.update({
-                "success": True,
-                "request_id": request_id,
-                "drafted_reply": drafted_reply,
-                "moderation_flags": moderation_flags,
-                "confidence": confidence
-            })
+            return self._queued_result(request_data)
             
         except Exception as e:
-            logger.error(f"Error processing Reddit query: {e}")
-            result["error"] = str(e)
+            _limited.error(("process", type(e)), "Error processing Reddit query: %s", e)
+            return self._failed_result(str(e))
+
+    def _build_request(self, post_data: Dict[str, Any], drafted_reply: str, confidence: float) -> Dict[str, Any]:
+        """Moderate a drafted reply and build the request record for its post"""
+        # Moderate the drafted response
+        moderation_flags = []
+        moderation_score = 1.0  # Default to safe
         
-        return result
+        if analyze_text_result and drafted_reply:
+            try:
+                moderation_result = analyze_text_result(drafted_reply)
+                if moderation_result.is_flagged:
+                    moderation_flags = moderation_result.flags
+                    moderation_score = 0.5
+                if moderation_result.safety_score is not None:
+                    moderation_score = moderation_result.safety_score
+            except Exception as e:
+                _limited.warning(("moderation", type(e)), "Moderation failed: %s", e)
+                moderation_flags.append("moderation_error")
+                moderation_score = 0.5
+        
+        return {
+            "id": str(uuid.uuid4()),
+            "subreddit": post_data.get('subreddit', 'unknown'),
+            "post_id": post_data.get('id'),
+            "post_title": post_data.get('title', ''),
+            "post_content": post_data.get('selftext', ''),
+            "post_author": post_data.get('author', 'unknown'),
+            "post_url": post_data.get('url', ''),
+            "status": STATUS_PENDING,
+            "drafted_reply": drafted_reply,
+            "plain_reply": markdown_to_plain_text(drafted_reply),
+            "moderation_score": moderation_score,
+            "moderation_flags": moderation_flags,
+            "agent_confidence": confidence,
+            "citations": []
+        }
+
+    @staticmethod
+    def _draft_action_data(request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Audit payload of the draft_generated action"""
+        return {
+            "confidence": request_data["agent_confidence"],
+            "moderation_score": request_data["moderation_score"],
+            "flags": request_data["moderation_flags"]
+        }
+
+    @staticmethod
+    def _queued_result(request_data: Dict[str, Any]) -> Dict[str, Any]:
+        """process_reddit_query result for a stored request"""
+        return {
+            "success": True,
+            "request_id": request_data["id"],
+            "error": None,
+            "drafted_reply": request_data["drafted_reply"],
+            "moderation_flags": request_data["moderation_flags"],
+            "confidence": request_data["agent_confidence"]
+        }
+
+    @staticmethod
+    def _failed_result(error: str) -> Dict[str, Any]:
+        """process_reddit_query result for a post that was not queued"""
+        return {
+            "success": False,
+            "request_id": None,
+            "error": error,
+            "drafted_reply": None,
+            "moderation_flags": [],
+            "confidence": 0.0
+        }
     
     def approve_request(self, request_id: str, admin_feedback: str = "", edited_reply: str = "") -> Dict[str, Any]:
         """
@@ -278,36 +473,107 @@ class ApprovalWorkflow:
         }
         
         try:
-            if not self.db:
-                result["error"] = "Database not available"
-                return result
-            
-            # Get the request
-            request = self.db.get_request_by_id(request_id)
-            if not request:
-                result["error"] = "Request not found"
-                return result
-            
-            if request['status'] != 'pending':
-                result["error"] = f"Request status is '{request['status']}', not pending"
-                return result
-            
-            # Use edited reply if provided, otherwise use original draft
-            final_reply = edited_reply.strip() if edited_reply else request['drafted_reply']
-            
-            if not final_reply:
-                result["error"] = "No reply content to post"
+            request, final_reply, error = self._prepare_approval(request_id, edited_reply, admin_feedback)
+        except Exception as e:
+            return self._approval_failed(request_id, e, result)
+        if error:
+            result["error"] = error
+            return result
+        
+        return self._post_approval(request_id, request, final_reply, admin_feedback, edited_reply, result)
+    
+    def approve_request_submit(self, request_id: str, admin_feedback: str = "", edited_reply: str = "") -> Dict[str, Any]:
+        """
+        Validate and accept an approval, then post to Reddit on a background worker.
+        
+        The request is marked 'posting' until the worker records 'approved' or 'error'.
+        
+        Returns:
+            Dictionary with "accepted" and, when accepted, a "future" resolving to the
+            approve_request-style result
+        """
+        result = {
+            "success": False,
+            "accepted": False,
+            "error": None,
+            "future": None
+        }
+        
+        try:
+            request, final_reply, error = self._prepare_approval(request_id, edited_reply, admin_feedback)
+            if error:
+                result["error"] = error
                 return result
-            
-            # Convert markdown to plain text for Reddit posting
+        except Exception as e:
+            logger.error("Error approving request: %s", e)
+            result["error"] = str(e)
+            return result
+        
+        posted = {
+            "success": False,
+            "reddit_posted": False,
+            "error": None,
+            "reddit_reply_id": None
+        }
+        result.update({
+            "success": True,
+            "accepted": True,
+            "future": self._executor.submit(
+                self._post_approval, request_id, request, final_reply, admin_feedback, edited_reply, posted
+            )
+        })
+        return result
+    
+    def _prepare_approval(self, request_id: str, edited_reply: str, admin_feedback: str):
+        """
+        Load and validate a request, then claim it by moving it from pending to 'posting'.
+        
+        Returns (request, final_reply, error); error is set when nothing was claimed.
+        """
+        if not self.db:
+            return None, None, "Database not available"
+        
+        # Get the request
+        request = self._get_request(request_id)
+        if not request:
+            return None, None, "Request not found"
+        
+        if request['status'] != STATUS_PENDING:
+            return None, None, f"Request status is '{request['status']}', not pending"
+        
+        # Use edited reply if provided, otherwise use original draft
+        final_reply = edited_reply.strip() if edited_reply else request['drafted_reply']
+        
+        if not final_reply:
+            return None, None, "No reply content to post"
+        
+        # Convert markdown to plain text for Reddit posting; unedited drafts were
+        # converted when they were generated
+        if edited_reply or not request.get('plain_reply'):
             final_reply = markdown_to_plain_text(final_reply)
-            
+        else:
+            final_reply = request['plain_reply']
+        
+        if not self._dry_run and not self._get_reddit_tool():
+            return None, None, "Reddit tool not available"
+        
+        # The status check above may have read a cached row; the guarded UPDATE is authoritative
+        self._forget_request(request_id)
+        if not self.db.claim_request(request_id, STATUS_POSTING, human_feedback=admin_feedback):
+            return None, None, "Request is no longer pending"
+        
+        return request, final_reply, None
+    
+    def _post_approval(self, request_id: str, request: Dict[str, Any], final_reply: str,
+                       admin_feedback: str, edited_reply: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Post an approved reply (or simulate it in dry run) and record the outcome"""
+        try:
             # Check if dry run mode
-            dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
+            dry_run = self._dry_run
             
             if dry_run:
                 # Simulate Reddit posting in dry run mode
-                logger.info(f"DRY RUN: Would post reply to {request['post_id']}")
+                logger.info("DRY RUN: Would post reply to %s", request['post_id'])
                 reddit_result = {
                     "status": "success",
                     "message": "DRY RUN: Reply simulated successfully",
@@ -318,26 +584,22 @@ class ApprovalWorkflow:
                 # Actually post to Reddit
                 reddit_tool = self._get_reddit_tool()
                 if not reddit_tool:
+                    # Hand the claimed request back to the queue
+                    self._update_status(request_id=request_id, status=STATUS_PENDING)
                     result["error"] = "Reddit tool not available"
                     return result
                 
-                logger.info(f"Posting reply to Reddit post {request['post_id']}")
+                logger.info("Posting reply to Reddit post %s", request['post_id'])
                 reddit_result = reddit_tool.post_reply(request['post_id'], final_reply)
             
             # Check Reddit posting result
             if reddit_result.get("status") == "success":
-                # Update request status to approved and posted
-                self.db.update_request_status(
+                # Mark approved and log the action in one transaction
+                self._forget_request(request_id)
+                self.db.approve_and_log(
                     request_id=request_id,
-                    status="approved",
                     final_reply=final_reply,
-                    human_feedback=admin_feedback
-                )
-                
-                # Log the action
-                self.db.log_user_action(
-                    action_type="request_approved",
-                    request_id=request_id,
+                    human_feedback=admin_feedback,
                     action_data={
                         "reddit_reply_id": reddit_result.get("reply_id"),
                         "admin_feedback": admin_feedback,
@@ -352,11 +614,11 @@ class ApprovalWorkflow:
                     "reddit_reply_id": reddit_result.get("reply_id")
                 })
                 
-                logger.info(f"Request {request_id} approved and posted successfully")
+                logger.info("Request %s approved and posted successfully", request_id)
                 
             elif reddit_result.get("status") == "skipped":
                 # Already replied - still mark as approved but don't post again
-                self.db.update_request_status(
+                self._update_status(
                     request_id=request_id,
                     status="approved",
                     final_reply=final_reply,
@@ -372,10 +634,10 @@ class ApprovalWorkflow:
             else:
                 # Reddit posting failed
                 error_msg = reddit_result.get("message", "Unknown Reddit error")
-                logger.error(f"Reddit posting failed: {error_msg}")
+                _limited.error("reddit_post", "Reddit posting failed: %s", error_msg)
                 
                 # Update status to error
-                self.db.update_request_status(
+                self._update_status(
                     request_id=request_id,
                     status="error",
                     human_feedback=f"Reddit posting failed: {error_msg}"
@@ -384,19 +646,25 @@ class ApprovalWorkflow:
                 result["error"] = f"Reddit posting failed: {error_msg}"
             
         except Exception as e:
-            logger.error(f"Error approving request: {e}")
-            result["error"] = str(e)
-            
-            # Try to update status to error
-            if self.db:
-                try:
-                    self.db.update_request_status(
-                        request_id=request_id,
-                        status="error",
-                        human_feedback=f"Approval error: {str(e)}"
-                    )
-                except:
-                    pass
+            return self._approval_failed(request_id, e, result)
+        
+        return result
+    
+    def _approval_failed(self, request_id: str, error: Exception, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Record an unexpected approval error on the request and in result"""
+        logger.error("Error approving request: %s", error)
+        result["error"] = str(error)
+        
+        # Try to update status to error
+        if self.db:
+            try:
+                self._update_status(
+                    request_id=request_id,
+                    status="error",
+                    human_feedback=f"Approval error: {str(error)}"
+                )
+            except:
+                pass
         
         return result
     
@@ -422,36 +690,33 @@ class ApprovalWorkflow:
                 return result
             
             # Get the request
-            request = self.db.get_request_by_id(request_id)
+            request = self._get_request(request_id)
             if not request:
                 result["error"] = "Request not found"
                 return result
             
-            if request['status'] != 'pending':
+            if request['status'] != STATUS_PENDING:
                 result["error"] = f"Request status is '{request['status']}', not pending"
                 return result
             
-            # Update request status to rejected
-            self.db.update_request_status(
-                request_id=request_id,
-                status="rejected",
-                human_feedback=admin_feedback or "Rejected by admin"
-            )
-            
-            # Log the action
-            self.db.log_user_action(
-                action_type="request_rejected",
+            # Mark rejected and log the action in one transaction, unless another
+            # session acted on the request after it was read
+            self._forget_request(request_id)
+            if not self.db.reject_and_log(
                 request_id=request_id,
+                human_feedback=admin_feedback or "Rejected by admin",
                 action_data={
                     "admin_feedback": admin_feedback
                 }
-            )
+            ):
+                result["error"] = "Request is no longer pending"
+                return result
             
             result["success"] = True
-            logger.info(f"Request {request_id} rejected")
+            logger.info("Request %s rejected", request_id)
             
         except Exception as e:
-            logger.error(f"Error rejecting request: {e}")
+            logger.error("Error rejecting request: %s", e)
             result["error"] = str(e)
         
         return result
@@ -462,49 +727,87 @@ class ApprovalWorkflow:
             return []
         
         try:
-            return self.db.get_pending_requests()
+            requests = self.db.get_pending_requests()
+            self._cache_requests(requests)
+            return requests
         except Exception as e:
-            logger.error(f"Error getting pending requests: {e}")
+            logger.error("Error getting pending requests: %s", e)
             return []
     
+    def get_pending_requests_columnar(self) -> Dict[str, List[Any]]:
+        """Get pending requests as a dict of column lists"""
+        if not self.db:
+            return {}
+        
+        try:
+            return self.db.get_pending_requests_columnar()
+        except Exception as e:
+            logger.error("Error getting pending requests: %s", e)
+            return {}
+    
+    def approve_many(self, request_ids: List[str], admin_feedback: str = "") -> Dict[str, Dict[str, Any]]:
+        """
+        Approve several pending requests, fetching them in a single query
+        
+        Returns:
+            Dictionary mapping each request ID to its approve_request result
+        """
+        if self.db:
+            try:
+                self._cache_requests(list(self.db.get_requests_by_ids(request_ids).values()))
+            except Exception as e:
+                logger.error("Error fetching requests for bulk approval: %s", e)
+        return {
+            request_id: self.approve_request(request_id, admin_feedback=admin_feedback)
+            for request_id in request_ids
+        }
+    
     def get_request_stats(self) -> Dict[str, Any]:
         """Get statistics about requests"""
+        stats = {
+            "total": 0,
+            "pending": 0,
+            "approved": 0,
+            "rejected": 0,
+            "error": 0
+        }
         if not self.db:
-            return {
-                "total": 0,
-                "pending": 0,
-                "approved": 0,
-                "rejected": 0,
-                "error": 0
-            }
+            return stats
+        
+        now = time.monotonic()
+        if self._stats_cache and now < self._stats_cache[0]:
+            return dict(self._stats_cache[1])
         
         try:
-            # Get counts by status
-            all_requests = self.db.get_requests_by_filter({"limit": 1000})
-            stats = {
-                "total": len(all_requests),
-                "pending": 0,
-                "approved": 0,
-                "rejected": 0,
-                "error": 0
-            }
-            
-            for request in all_requests:
-                status = request.get('status', 'unknown')
+            # Counts by status, aggregated in SQLite
+            status_counts = self.db.get_status_counts()
+            stats["total"] = sum(status_counts.values())
+            for status, count in status_counts.items():
                 if status in stats:
-                    stats[status] += 1
-                    
-            return stats
+                    stats[status] = count
+            
+            self._stats_cache = (now + STATS_CACHE_TTL, stats)
+            return dict(stats)
             
         except Exception as e:
-            logger.error(f"Error getting request stats: {e}")
-            return {
-                "total": 0,
-                "pending": 0,
-                "approved": 0,
-                "rejected": 0,
-                "error": 0
-            }
+            logger.error("Error getting request stats: %s", e)
+            return stats
+
+# Shared instance, created on first use so importing this module stays cheap
+_approval_workflow_singleton = None
+_approval_workflow_lock = threading.Lock()
+
+def get_approval_workflow() -> ApprovalWorkflow:
+    """Return the process-wide ApprovalWorkflow, creating it on first call"""
+    global _approval_workflow_singleton
+    if _approval_workflow_singleton is None:
+        with _approval_workflow_lock:
+            if _approval_workflow_singleton is None:
+                _approval_workflow_singleton = ApprovalWorkflow()
+    return _approval_workflow_singleton
 
-# Create global instance
-approval_workflow = ApprovalWorkflow()
+def __getattr__(name: str):
+    # Keep `from approval_workflow import approval_workflow` working for older scripts
+    if name == "approval_workflow":
+        return get_approval_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
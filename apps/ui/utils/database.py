@@ -1,11 +1,82 @@
 import json
 import sqlite3
 import os
+import threading
 import uuid
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from pathlib import Path
 
+# JSON helpers for the JSON columns, also imported by the other UI utils. orjson encodes
+# and parses in C; fall back to the stdlib when absent
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps(obj) -> str:
+        # Non-string keys are stringified, as json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Long post bodies are stored zstd-compressed in post_content_zstd when zstandard is installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Shorter bodies gain too little from compression to be worth it
+COMPRESS_MIN_CHARS = 512
+
+# Status of a request waiting for human review; the requests.status column default
+STATUS_PENDING = 'pending'
+# Status of an approved request while its reply is being posted to Reddit
+STATUS_POSTING = 'posting'
+# Minutes after which a request still marked posting is assumed orphaned by a crash
+POSTING_TIMEOUT_MINUTES = 15
+
+# Applied to every new connection. WAL lets UI reads proceed while a worker thread is
+# writing; the rest keep temp tables in RAM and give each connection a 64 MB page
+# cache plus up to 256 MB of memory-mapped reads.
+# synchronous=NORMAL only fsyncs the WAL at checkpoints: the database can't be
+# corrupted, but the last few commits may be lost if the OS crashes or power fails
+# (an application crash loses nothing). Acceptable for a review queue that the
+# scheduler refills from Reddit.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Connections per thread, keyed by database file and shared by every DatabaseManager on
+# that file: pages build a DatabaseManager on each rerun, and reuse spares them reopening
+# the file and replaying the PRAGMAs.
+_shared_conns = threading.local()
+# Database files whose schema this process has already created or migrated
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+def _compress_content(text: Optional[str]) -> tuple:
+    """(post_content, post_content_zstd) column values for a post body"""
+    if zstandard is None or not text or len(text) < COMPRESS_MIN_CHARS:
+        return text, None
+    return None, zstandard.compress(text.encode('utf-8'), 3)
+
+def _decompress_content(blob: Optional[bytes]) -> Optional[str]:
+    """SQL function zstd_text(): the post body _compress_content stored"""
+    if blob is None:
+        return None
+    if zstandard is None:
+        raise RuntimeError("post_content is zstd-compressed; install zstandard to read it")
+    return zstandard.decompress(blob).decode('utf-8')
+
 class DatabaseManager:
     """
     Manages SQLite database for storing agent requests, responses, analytics, and settings
@@ -14,21 +85,51 @@ class DatabaseManager:
     def __init__(self, db_path: str = "data/agent_data.db"):
         # Special-case in-memory DB; do not alter the path
         if db_path == ":memory:":
+            # Every :memory: connection is a separate database, so nothing is shared
+            self._tls = threading.local()
             self.db_path = db_path
             self.init_database()
             return
+        self._tls = _shared_conns
         # If relative path, make it relative to project root
         if not os.path.isabs(db_path):
             project_root = Path(__file__).parent.parent.parent.parent
             db_path = str(project_root / db_path)
         
         self.db_path = db_path
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        self.init_database()
+        with _init_lock:
+            if db_path not in _initialized_paths:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self.init_database()
+                _initialized_paths.add(db_path)
+    
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it in WAL mode on first use"""
+        conns = getattr(self._tls, 'conns', None)
+        if conns is None:
+            conns = self._tls.conns = {}
+        conn = conns.get(self.db_path)
+        if conn is None:
+            # Room for every distinct statement this class issues, so none are re-prepared
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.create_function("zstd_text", 1, _decompress_content, deterministic=True)
+            for pragma in _CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            conns[self.db_path] = conn
+        return conn
+    
+    def close(self):
+        """Close the calling thread's connection, if any; the next call reopens it"""
+        conn = getattr(self._tls, 'conns', {}).pop(self.db_path, None)
+        if conn is not None:
+            conn.close()
     
     def init_database(self):
         """Initialize database tables"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
+            # requests stays a rowid table: its rows carry kilobytes of post and reply text,
+            # and SQLite advises WITHOUT ROWID only for rows well under 1/20 of a page.
             conn.executescript('''
                 CREATE TABLE IF NOT EXISTS requests (
                     id TEXT PRIMARY KEY,
@@ -37,10 +138,12 @@ class DatabaseManager:
                     post_id TEXT,
                     post_title TEXT,
                     post_content TEXT,
+                    post_content_zstd BLOB,
                     post_author TEXT,
                     post_url TEXT,
                     status TEXT NOT NULL DEFAULT 'pending',
                     drafted_reply TEXT,
+                    plain_reply TEXT,
                     final_reply TEXT,
                     moderation_score REAL,
                     moderation_flags TEXT,
@@ -49,7 +152,8 @@ class DatabaseManager:
                     citations TEXT,
                     human_feedback TEXT,
                     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    created_date TEXT GENERATED ALWAYS AS (DATE(created_at)) VIRTUAL
                 );
                 
                 CREATE TABLE IF NOT EXISTS agent_runs (
@@ -98,90 +202,282 @@ class DatabaseManager:
                 
                 CREATE INDEX IF NOT EXISTS idx_requests_status ON requests(status);
                 CREATE INDEX IF NOT EXISTS idx_requests_subreddit ON requests(subreddit);
+                CREATE INDEX IF NOT EXISTS idx_requests_post_id ON requests(post_id);
                 CREATE INDEX IF NOT EXISTS idx_requests_timestamp ON requests(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_requests_created_at_id ON requests(created_at, id);
                 CREATE INDEX IF NOT EXISTS idx_agent_runs_status ON agent_runs(status);
             ''')
+            self._migrate(conn)
+    
+    @staticmethod
+    def _release_stale_posting(conn: sqlite3.Connection):
+        """Return requests left in posting by a process that died mid-post to the review queue"""
+        # A post that did reach Reddit is caught on the next approval by RedditTool's
+        # already-replied check, so requeueing can't double-post.
+        conn.execute(f'''
+            UPDATE requests SET status = '{STATUS_PENDING}', updated_at = CURRENT_TIMESTAMP
+            WHERE status = '{STATUS_POSTING}' AND updated_at < datetime('now', ?)
+        ''', (f"-{POSTING_TIMEOUT_MINUTES} minutes",))
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add columns introduced after a database file was first created"""
+        # table_xinfo, unlike table_info, also lists generated columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(requests)")}
+        if 'plain_reply' not in columns:
+            # Plain-text rendering of drafted_reply, posted as-is when the draft is approved unedited
+            conn.execute("ALTER TABLE requests ADD COLUMN plain_reply TEXT")
+        if 'post_content_zstd' not in columns:
+            conn.execute("ALTER TABLE requests ADD COLUMN post_content_zstd BLOB")
+        if 'created_date' not in columns:
+            # Day of created_at, so analytics can filter and group through an index instead of calling DATE() per row
+            conn.execute("ALTER TABLE requests ADD COLUMN created_date TEXT GENERATED ALWAYS AS (DATE(created_at)) VIRTUAL")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_created_date_status ON requests(created_date, status)")
+        # Older scheduler builds queued posts as 'pendin   g', which kept them out of the review queue
+        conn.execute(f"UPDATE requests SET status = '{STATUS_PENDING}' WHERE status = 'pendin   g'")
+        if 'updated_at' in columns:
+            self._release_stale_posting(conn)
     
     # -----------------------------
     # Request Management
     # -----------------------------
-    def add_request(self, request_data: Dict[str, Any]) -> str:
-        """Add a new request to the database"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO requests (
-                    id, subreddit, post_id, post_title, post_content, 
-                    post_author, post_url, status, drafted_reply, 
-                    moderation_score, moderation_flags, agent_confidence, citations
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                request_data.get('id'),
-                request_data.get('subreddit'),
-                request_data.get('post_id'),
-                request_data.get('post_title'),
-                request_data.get('post_content'),
-                request_data.get('post_author'),
-                request_data.get('post_url'),
-                request_data.get('status', 'pending'),
-                request_data.get('drafted_reply'),
-                request_data.get('moderation_score'),
-                json.dumps(request_data.get('moderation_flags', [])),
-                request_data.get('agent_confidence'),
-                json.dumps(request_data.get('citations', []))
-            ))
-            return request_data.get('id')
+    # Built once so every call passes the identical string and hits the statement cache.
+    # A row whose post_id is already stored is skipped inside the same statement, so
+    # concurrent ingestion can't race between an existence check and the insert.
+    _INSERT_REQUEST_SQL = '''
+        INSERT {conflict}INTO requests (
+            id, subreddit, post_id, post_title, post_content, post_content_zstd,
+            post_author, post_url, status, drafted_reply, plain_reply,
+            moderation_score, moderation_flags, agent_confidence, citations
+        ) SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+        WHERE NOT EXISTS (SELECT 1 FROM requests WHERE post_id = ?)
+    '''
+    _ADD_REQUEST_SQL = _INSERT_REQUEST_SQL.format(conflict='')
+    _ADD_REQUEST_IGNORE_SQL = _INSERT_REQUEST_SQL.format(conflict='OR IGNORE ')
+
+    # Every requests column callers see, with post_content read back from whichever
+    # column it was stored in; the raw post_content_zstd BLOB is never returned.
+    _REQUEST_COLUMNS = '''
+        id, timestamp, subreddit, post_id, post_title,
+        COALESCE(post_content, zstd_text(post_content_zstd)) AS post_content,
+        post_author, post_url, status, drafted_reply, plain_reply, final_reply,
+        moderation_score, moderation_flags, processing_time, agent_confidence,
+        citations, human_feedback, created_at, updated_at, created_date
+    '''
+
+    _LOG_USER_ACTION_SQL = '''
+        INSERT INTO user_actions (action_type, request_id, user_id, action_data)
+        VALUES (?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _request_params(request_data: Dict[str, Any]) -> tuple:
+        """Build the INSERT parameter tuple for a request dict (post_id repeats for the duplicate check)"""
+        return (
+            request_data.get('id'),
+            request_data.get('subreddit'),
+            request_data.get('post_id'),
+            request_data.get('post_title'),
+            *_compress_content(request_data.get('post_content')),
+            request_data.get('post_author'),
+            request_data.get('post_url'),
+            request_data.get('status', STATUS_PENDING),
+            request_data.get('drafted_reply'),
+            request_data.get('plain_reply'),
+            request_data.get('moderation_score'),
+            json_dumps(request_data.get('moderation_flags', [])),
+            request_data.get('agent_confidence'),
+            json_dumps(request_data.get('citations', [])),
+            request_data.get('post_id')
+        )
+
+    def add_request(self, request_data: Dict[str, Any]) -> Optional[str]:
+        """Add a new request to the database; returns its ID, or None if its post_id is already stored"""
+        with self._conn() as conn:
+            cursor = conn.execute(
+                self._ADD_REQUEST_SQL,
+                self._request_params(request_data)
+            )
+            return request_data.get('id') if cursor.rowcount == 1 else None
+    
+    def add_requests_bulk(self, requests: List[Dict[str, Any]]) -> int:
+        """Insert many requests in a single transaction; returns the number of rows inserted"""
+        if not requests:
+            return 0
+        with self._conn() as conn:
+            cursor = conn.executemany(
+                self._ADD_REQUEST_IGNORE_SQL,
+                [self._request_params(r) for r in requests]
+            )
+            return cursor.rowcount
+    
+    # Queues a fetched post with no draft yet. Rows are tuples in POST_ROW_FIELDS order;
+    # ?3 (post_id) doubles as the duplicate check. created_at is left to its default, the
+    # time the post was queued, as for requests the agent drafts.
+    POST_ROW_FIELDS = ('id', 'subreddit', 'post_id', 'post_title', 'post_content',
+                       'post_author', 'post_url')
+    _ADD_POST_ROW_SQL = f'''
+        INSERT OR IGNORE INTO requests (
+            id, subreddit, post_id, post_title, post_content, post_content_zstd,
+            post_author, post_url,
+            status, drafted_reply, agent_confidence, moderation_flags, citations
+        ) SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, '{STATUS_PENDING}', '', 0.0, '[]', '[]'
+        WHERE NOT EXISTS (SELECT 1 FROM requests WHERE post_id = ?3)
+    '''
+
+    def add_post_rows(self, rows: Iterable[tuple]) -> int:
+        """
+        Queue undrafted posts given as POST_ROW_FIELDS tuples, in one transaction.
+        
+        rows may be a generator; it is consumed as the rows are bound. Returns the
+        number of rows inserted; known post_ids and ids are skipped.
+        """
+        with self._conn() as conn:
+            cursor = conn.executemany(
+                self._ADD_POST_ROW_SQL,
+                ((*row[:4], *_compress_content(row[4]), *row[5:]) for row in rows)
+            )
+            return max(cursor.rowcount, 0)
+    
+    def add_requests_and_log(self, requests: List[Dict[str, Any]], action_type: str,
+                             action_data: List[Dict], user_id: str = 'admin') -> List[str]:
+        """
+        add_requests_bulk plus an audit entry (action_data[i] for requests[i]) for each request
+        actually inserted, written in a single transaction; returns the inserted request IDs.
+        """
+        inserted = []
+        if not requests:
+            return inserted
+        with self._conn() as conn:
+            # Row by row, so requests skipped as duplicates get no audit entry
+            for request_data, data in zip(requests, action_data):
+                if conn.execute(self._ADD_REQUEST_IGNORE_SQL, self._request_params(request_data)).rowcount != 1:
+                    continue
+                conn.execute(self._LOG_USER_ACTION_SQL,
+                             (action_type, request_data.get('id'), user_id, json_dumps(data or {})))
+                inserted.append(request_data.get('id'))
+        return inserted
     
     def insert_request(self, request_data: Dict[str, Any]) -> str:
         """
         Compatibility wrapper for add_request.
         Ensures unique ID and avoids duplicate post_ids.
         """
-        # Avoid duplicate Reddit post ingestion
-        if self.request_exists_by_post_id(request_data.get("post_id")):
-            return request_data.get("id") or request_data.get("post_id")
+        original_id = request_data.get("id")
         
         # Ensure a unique ID
-        if not request_data.get("id"):
+        if not original_id:
             request_data["id"] = str(uuid.uuid4())
         
-        return self.add_request(request_data)
+        # add_request skips duplicate Reddit posts itself
+        return self.add_request(request_data) or original_id or request_data.get("post_id")
     
     def update_request_status(self, request_id: str, status: str, 
                             final_reply: str = None, human_feedback: str = None):
         """Update request status and final reply"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 UPDATE requests 
                 SET status = ?, final_reply = ?, human_feedback = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             ''', (status, final_reply, human_feedback, request_id))
     
+    def claim_request(self, request_id: str, status: str, human_feedback: str = None) -> bool:
+        """Move a pending request to status; returns False if it was no longer pending"""
+        with self._conn() as conn:
+            cursor = conn.execute(f'''
+                UPDATE requests 
+                SET status = ?, human_feedback = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = '{STATUS_PENDING}'
+            ''', (status, human_feedback, request_id))
+            return cursor.rowcount == 1
+    
+    def approve_and_log(self, request_id: str, final_reply: str = None, human_feedback: str = None,
+                        action_data: Dict = None, user_id: str = 'admin'):
+        """Mark a request approved and record the audit entry in one transaction"""
+        self._update_status_and_log(request_id, 'approved', 'request_approved',
+                                    final_reply, human_feedback, action_data, user_id)
+    
+    def reject_and_log(self, request_id: str, human_feedback: str = None,
+                       action_data: Dict = None, user_id: str = 'admin') -> bool:
+        """Reject a pending request and record the audit entry; returns False if it was no longer pending"""
+        return self._update_status_and_log(request_id, 'rejected', 'request_rejected',
+                                           None, human_feedback, action_data, user_id,
+                                           expected_status=STATUS_PENDING)
+    
+    def _update_status_and_log(self, request_id: str, status: str, action_type: str,
+                               final_reply: Optional[str], human_feedback: Optional[str],
+                               action_data: Optional[Dict], user_id: str,
+                               expected_status: Optional[str] = None) -> bool:
+        query = '''
+            UPDATE requests 
+            SET status = ?, final_reply = ?, human_feedback = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        '''
+        params = (status, final_reply, human_feedback, request_id)
+        if expected_status is not None:
+            query += " AND status = ?"
+            params += (expected_status,)
+        with self._conn() as conn:
+            if conn.execute(query, params).rowcount != 1:
+                return False
+            conn.execute(self._LOG_USER_ACTION_SQL, (action_type, request_id, user_id, json_dumps(action_data or {})))
+            return True
+    
+    _PENDING_REQUESTS_SQL = f'''
+        SELECT {_REQUEST_COLUMNS} FROM requests 
+        WHERE status = '{STATUS_PENDING}' 
+        ORDER BY created_at DESC
+    '''
+
+    def iter_pending_requests(self) -> Iterator[sqlite3.Row]:
+        """
+        Yield pending requests as sqlite3.Row objects, read from the cursor as consumed.
+        
+        Rows support row['column'] but not .get(); use get_pending_requests for dicts.
+        """
+        yield from self._conn().execute(self._PENDING_REQUESTS_SQL)
+
     def get_pending_requests(self) -> List[Dict[str, Any]]:
         """Get all pending requests for approval"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM requests 
-                WHERE status = 'pending' 
-                ORDER BY created_at DESC
-            ''')
-            return [dict(row) for row in cursor.fetchall()]
+        return [dict(row) for row in self.iter_pending_requests()]
+
+    def get_pending_requests_columnar(self) -> Dict[str, List[Any]]:
+        """Get pending requests as column lists (e.g. for pd.DataFrame) instead of one dict per row"""
+        with self._conn() as conn:
+            cursor = conn.execute(self._PENDING_REQUESTS_SQL)
+            columns = [col[0] for col in cursor.description]
+            rows = cursor.fetchall()
+            if not rows:
+                return {name: [] for name in columns}
+            return {name: list(values) for name, values in zip(columns, zip(*rows))}
 
     def get_request_by_id(self, request_id: str) -> Optional[Dict[str, Any]]:
         """Fetch a single request by its ID"""
         if not request_id:
             return None
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM requests WHERE id = ? LIMIT 1
+        with self._conn() as conn:
+            cursor = conn.execute(f'''
+                SELECT {self._REQUEST_COLUMNS} FROM requests WHERE id = ? LIMIT 1
             ''', (request_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
     
+    def get_requests_by_ids(self, request_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch several requests in one query, keyed by ID (missing IDs are omitted)"""
+        request_ids = [rid for rid in request_ids if rid]
+        if not request_ids:
+            return {}
+        placeholders = ','.join('?' * len(request_ids))
+        with self._conn() as conn:
+            cursor = conn.execute(
+                f'SELECT {self._REQUEST_COLUMNS} FROM requests WHERE id IN ({placeholders})',
+                request_ids
+            )
+            return {row['id']: dict(row) for row in cursor.fetchall()}
+    
     def get_requests_by_filter(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get requests with filters"""
-        query = "SELECT * FROM requests WHERE 1=1"
+        query = f"SELECT {self._REQUEST_COLUMNS} FROM requests WHERE 1=1"
         params = []
         
         if filters.get('status'):
@@ -200,65 +496,119 @@ class DatabaseManager:
             query += " AND created_at <= ?"
             params.append(filters['date_to'])
         
-        query += " ORDER BY created_at DESC LIMIT ?"
+        # Keyset pagination: continue strictly after the last row of the previous page
+        if filters.get('cursor_created_at'):
+            if filters.get('cursor_id'):
+                query += " AND (created_at, id) < (?, ?)"
+                params.extend([filters['cursor_created_at'], filters['cursor_id']])
+            else:
+                query += " AND created_at < ?"
+                params.append(filters['cursor_created_at'])
+        
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
         params.append(filters.get('limit', 100))
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._conn() as conn:
             cursor = conn.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_requests_page(self, filters: Dict[str, Any]) -> tuple:
+        """
+        Get one page of get_requests_by_filter and the cursor for the next page.
+        
+        Merge the returned cursor into filters to fetch the following page; it is
+        None once a page comes back short.
+        """
+        rows = self.get_requests_by_filter(filters)
+        if len(rows) < filters.get('limit', 100):
+            return rows, None
+        last = rows[-1]
+        return rows, {'cursor_created_at': last['created_at'], 'cursor_id': last['id']}
+    
+    def get_recent_requests(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Get the newest requests for activity feeds and cards.
+        
+        Only the displayed columns are read, and long text is cut in SQLite just past
+        what create_request_card shows. Use get_request_by_id for the full row.
+        """
+        with self._conn() as conn:
+            cursor = conn.execute('''
+                SELECT id, subreddit, post_id, post_title,
+                       substr(COALESCE(post_content, zstd_text(post_content_zstd)), 1, 220) AS post_content,
+                       post_author, status,
+                       substr(drafted_reply, 1, 320) AS drafted_reply,
+                       agent_confidence, created_at
+                FROM requests
+                ORDER BY created_at DESC LIMIT ?
+            ''', (limit,))
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_filter_options(self) -> Dict[str, List[str]]:
+        """Get every distinct subreddit and author, for the log filter widgets"""
+        with self._conn() as conn:
+            subreddits = [row[0] for row in conn.execute(
+                "SELECT DISTINCT subreddit FROM requests WHERE subreddit IS NOT NULL AND subreddit != ''"
+            )]
+            authors = [row[0] for row in conn.execute(
+                "SELECT DISTINCT post_author FROM requests WHERE post_author IS NOT NULL AND post_author != ''"
+            )]
+        return {'subreddits': subreddits, 'authors': authors}
+    
     # -----------------------------
     # Analytics
     # -----------------------------
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get the number of requests per status, counted in SQLite"""
+        with self._conn() as conn:
+            cursor = conn.execute('''
+                SELECT status, COUNT(*) FROM requests GROUP BY status
+            ''')
+            return dict(cursor.fetchall())
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Count requests, optionally restricted to one status"""
+        sql = 'SELECT COUNT(*) FROM requests'
+        params = ()
+        if status:
+            sql += ' WHERE status = ?'
+            params = (status,)
+        with self._conn() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
     def get_analytics_overview(self) -> Dict[str, Any]:
         """Get overview analytics for dashboard"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            # Total requests today
-            today = datetime.now().strftime('%Y-%m-%d')
-            cursor = conn.execute('''
-                SELECT COUNT(*) as total_today FROM requests 
-                WHERE DATE(created_at) = ?
-            ''', (today,))
-            total_today = cursor.fetchone()['total_today']
-            
-            # Pending requests
-            cursor = conn.execute('''
-                SELECT COUNT(*) as pending FROM requests WHERE status = 'pending'
+        with self._conn() as conn:
+            # Today's total, pending queue, 7-day approval rate and response time in one scan.
+            # Dates come from SQLite's local clock, matching datetime.now() on this host.
+            cursor = conn.execute(f'''
+                WITH bounds AS (
+                    SELECT date('now', 'localtime') AS today,
+                           date('now', 'localtime', '-7 days') AS week_ago
+                )
+                SELECT
+                    COUNT(CASE WHEN created_date = today THEN 1 END) as total_today,
+                    COUNT(CASE WHEN status = '{STATUS_PENDING}' THEN 1 END) as pending,
+                    COUNT(CASE WHEN created_date >= week_ago AND status = 'approved' THEN 1 END) as approved,
+                    COUNT(CASE WHEN created_date >= week_ago THEN 1 END) as total,
+                    AVG(CASE WHEN created_date >= week_ago THEN processing_time END) as avg_time
+                FROM requests, bounds
             ''')
-            pending = cursor.fetchone()['pending']
-            
-            # Approval rate (last 7 days)
-            week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-            cursor = conn.execute('''
-                SELECT 
-                    COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved,
-                    COUNT(*) as total
-                FROM requests 
-                WHERE DATE(created_at) >= ?
-            ''', (week_ago,))
-            approval_data = cursor.fetchone()
-            approval_rate = (approval_data['approved'] / approval_data['total'] * 100) if approval_data['total'] > 0 else 0
-            
-            # Average response time
-            cursor = conn.execute('''
-                SELECT AVG(processing_time) as avg_time 
-                FROM requests 
-                WHERE processing_time IS NOT NULL AND DATE(created_at) >= ?
-            ''', (week_ago,))
-            avg_time = cursor.fetchone()['avg_time'] or 0
+            overview = cursor.fetchone()
+            total_today = overview['total_today']
+            pending = overview['pending']
+            approval_rate = (overview['approved'] / overview['total'] * 100) if overview['total'] > 0 else 0
+            avg_time = overview['avg_time'] or 0
             
             # Top subreddits
             cursor = conn.execute('''
                 SELECT subreddit, COUNT(*) as count 
                 FROM requests 
-                WHERE DATE(created_at) >= ? 
+                WHERE created_date >= date('now', 'localtime', '-7 days') 
                 GROUP BY subreddit 
                 ORDER BY count DESC 
                 LIMIT 5
-            ''', (week_ago,))
+            ''')
             top_subreddits = [dict(row) for row in cursor.fetchall()]
             
             return {
@@ -269,59 +619,71 @@ class DatabaseManager:
                 'top_subreddits': top_subreddits
             }
     
+    _DAILY_STATS_SQL = '''
+        SELECT 
+            created_date as date,
+            COUNT(*) as total_requests,
+            COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved,
+            COUNT(CASE WHEN status = 'rejected' THEN 1 END) as rejected,
+            AVG(processing_time) as avg_time,
+            AVG(agent_confidence) as avg_confidence
+        FROM requests 
+        WHERE created_date >= date('now', 'localtime', ?)
+        GROUP BY created_date
+        ORDER BY date DESC
+    '''
+
     def get_daily_stats(self, days: int = 30) -> List[Dict[str, Any]]:
         """Get daily statistics for charts"""
-        start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT 
-                    DATE(created_at) as date,
-                    COUNT(*) as total_requests,
-                    COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved,
-                    COUNT(CASE WHEN status = 'rejected' THEN 1 END) as rejected,
-                    AVG(processing_time) as avg_time,
-                    AVG(agent_confidence) as avg_confidence
-                FROM requests 
-                WHERE DATE(created_at) >= ?
-                GROUP BY DATE(created_at)
-                ORDER BY date DESC
-            ''', (start_date,))
-            
+        with self._conn() as conn:
+            cursor = conn.execute(self._DAILY_STATS_SQL, (f'-{int(days)} days',))
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_daily_stats_df(self, days: int = 30):
+        """Get daily statistics as a pandas DataFrame with a datetime 'date' column"""
+        if pd is None:
+            raise RuntimeError("pandas is required for get_daily_stats_df")
+        return pd.read_sql_query(self._DAILY_STATS_SQL, self._conn(), params=(f'-{int(days)} days',), parse_dates=['date'])
+    
     # -----------------------------
     # User Actions
     # -----------------------------
     def log_user_action(self, action_type: str, request_id: str = None, 
                        user_id: str = 'admin', action_data: Dict = None):
         """Log user actions for audit trail"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                INSERT INTO user_actions (action_type, request_id, user_id, action_data)
-                VALUES (?, ?, ?, ?)
-            ''', (action_type, request_id, user_id, json.dumps(action_data or {})))
+        with self._conn() as conn:
+            conn.execute(self._LOG_USER_ACTION_SQL, (action_type, request_id, user_id, json_dumps(action_data or {})))
     
     def request_exists_by_post_id(self, post_id: str) -> bool:
         """Check if a request already exists for a given Reddit post_id"""
         if not post_id:
             return False
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._conn() as conn:
             cursor = conn.execute('''
                 SELECT 1 FROM requests WHERE post_id = ? LIMIT 1
             ''', (post_id,))
             return cursor.fetchone() is not None
     
+    def filter_existing_post_ids(self, post_ids: List[str]) -> set:
+        """Return the subset of post_ids that already have a request"""
+        post_ids = [pid for pid in post_ids if pid]
+        if not post_ids:
+            return set()
+        placeholders = ','.join('?' * len(post_ids))
+        with self._conn() as conn:
+            cursor = conn.execute(
+                f'SELECT post_id FROM requests WHERE post_id IN ({placeholders})',
+                post_ids
+            )
+            return {row[0] for row in cursor.fetchall()}
+    
     def get_request_by_post_id(self, post_id: str) -> Optional[Dict[str, Any]]:
         """Get a request by Reddit post_id"""
         if not post_id:
             return None
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute('''
-                SELECT * FROM requests WHERE post_id = ? LIMIT 1
+        with self._conn() as conn:
+            cursor = conn.execute(f'''
+                SELECT {self._REQUEST_COLUMNS} FROM requests WHERE post_id = ? LIMIT 1
             ''', (post_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
@@ -330,12 +692,12 @@ class DatabaseManager:
         Update the drafted reply for a specific request.
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._conn() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """
                     UPDATE requests
-                    SET drafted_reply = ?, updated_at = CURRENT_TIMESTAMP
+                    SET drafted_reply = ?, plain_reply = NULL, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                     """,
                     (draft, request_id)
@@ -350,21 +712,20 @@ class DatabaseManager:
     # -----------------------------
     def get_agent_settings(self) -> Dict[str, Any]:
         """Fetch agent settings from DB"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._conn() as conn:
             cursor = conn.execute("SELECT settings_json FROM agent_settings WHERE id = 1")
             row = cursor.fetchone()
             if row:
-                return json.loads(row["settings_json"])
+                return json_loads(row["settings_json"])
             return {}
 
     def save_agent_settings(self, settings: Dict[str, Any]):
         """Save agent settings into DB (overwrite row id=1)"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._conn() as conn:
             conn.execute('''
                 INSERT INTO agent_settings (id, settings_json, updated_at)
                 VALUES (1, ?, CURRENT_TIMESTAMP)
                 ON CONFLICT(id) DO UPDATE SET 
                     settings_json = excluded.settings_json,
                     updated_at = CURRENT_TIMESTAMP
-            ''', (json.dumps(settings),))
+            ''', (json_dumps(settings),))
@@ -1,19 +1,37 @@
 # apps/ui/utils/helpers.py
 
 import streamlit as st
+import html
 import json
 import os
+import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
-import hashlib
+from secrets import token_hex
+
+from utils.database import json_loads
+
+# orjson writes the JSON exports in C; fall back to the stdlib when absent
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@st.cache_data(show_spinner=False)
+def _read_css(file_path: str, mtime: float) -> str:
+    """Read a CSS file once per modification time"""
+    with open(file_path) as f:
+        return f.read()
 
 def load_css(file_path: str):
     """Load and inject CSS file into Streamlit"""
     try:
-        with open(file_path) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        css = _read_css(file_path, os.path.getmtime(file_path))
     except FileNotFoundError:
         st.warning(f"CSS file not found: {file_path}")
+        return
+    st.markdown(f'<style>{css}</style>', unsafe_allow_html=True)
 
 def init_session_state():
     """Initialize session state variables"""
@@ -32,11 +50,18 @@ def init_session_state():
     if 'auto_refresh' not in st.session_state:
         st.session_state.auto_refresh = False
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp: str) -> datetime:
+    """Parse an ISO timestamp; cached because list pages format the same rows on every rerun"""
+    if 'Z' in timestamp:
+        timestamp = timestamp.replace('Z', '+00:00')
+    return datetime.fromisoformat(timestamp)
+
 def format_timestamp(timestamp: str) -> str:
     """Format timestamp for display"""
     try:
         if isinstance(timestamp, str):
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            dt = _parse_timestamp(timestamp)
         else:
             dt = timestamp
         
@@ -56,16 +81,17 @@ def format_timestamp(timestamp: str) -> str:
     except:
         return "Unknown"
 
+# CSS classes for create_status_badge, built once
+_BADGE_CLASSES = {
+    'pending': 'status-badge pending',
+    'approved': 'status-badge approved',
+    'rejected': 'status-badge rejected',
+    'processing': 'status-badge processing'
+}
+
 def create_status_badge(status: str) -> str:
     """Create HTML status badge"""
-    badge_classes = {
-        'pending': 'status-badge pending',
-        'approved': 'status-badge approved',
-        'rejected': 'status-badge rejected',
-        'processing': 'status-badge processing'
-    }
-    
-    badge_class = badge_classes.get(status.lower(), 'status-badge')
+    badge_class = _BADGE_CLASSES.get(status.lower(), 'status-badge')
     return f'<span class="{badge_class}">{status}</span>'
 
 def create_metric_card(title: str, value: str, change: str = None, change_type: str = "neutral") -> str:
@@ -131,20 +157,29 @@ def export_data_to_json(data: List[Dict], filename: str) -> str:
     filepath = f"data/exports/{filename}"
     os.makedirs(os.path.dirname(filepath), exist_ok=True)
     
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2, default=str)
+    if orjson:
+        # Pass datetimes to default=str so they are written exactly as json.dump(default=str) would
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=options))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
     
     return filepath
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input to prevent XSS"""
-    import html
     return html.escape(text) if text else ""
 
 def generate_request_id() -> str:
-    """Generate unique request ID"""
-    timestamp = datetime.now().isoformat()
-    return hashlib.md5(timestamp.encode()).hexdigest()[:12]
+    """
+    Generate unique request ID.
+    
+    16 hex digits of time.time_ns() followed by 8 random hex digits, so IDs sort by
+    creation time and new rows append to the end of the primary-key B-tree.
+    """
+    return f"{time.time_ns():016x}{token_hex(4)}"
 
 def validate_reddit_credentials(credentials: Dict[str, str]) -> Dict[str, Any]:
     """Validate Reddit API credentials"""
@@ -215,7 +250,7 @@ def parse_citations(citations_json: str) -> List[Dict[str, str]]:
     try:
         if not citations_json:
             return []
-        citations = json.loads(citations_json)
+        citations = json_loads(citations_json)
         return citations if isinstance(citations, list) else []
     except:
         return []
@@ -250,3 +285,41 @@ def create_alert(message: str, alert_type: str = "info") -> str:
         <span class="alert-message">{message}</span>
     </div>
     '''
+
+# -----------------------------
+# Cached database reads
+# -----------------------------
+# Streamlit reruns every page on each widget interaction. These wrappers reuse the
+# last result until the database is written to; the leading underscore keeps the
+# DatabaseManager out of Streamlit's cache key.
+
+def db_version(db) -> tuple:
+    """Cache key that changes whenever the database file or its WAL file is written"""
+    stamps = [db.db_path]
+    for path in (db.db_path, db.db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_analytics_overview(_db, version: tuple) -> Dict[str, Any]:
+    """get_analytics_overview, reused until the database changes"""
+    return _db.get_analytics_overview()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_daily_stats(_db, days: int, version: tuple) -> List[Dict[str, Any]]:
+    """get_daily_stats, reused until the database changes"""
+    return _db.get_daily_stats(days)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_pending_requests(_db, version: tuple) -> List[Dict[str, Any]]:
+    """get_pending_requests, reused until the database changes"""
+    return _db.get_pending_requests()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_daily_stats_df(_db, days: int, version: tuple):
+    """get_daily_stats_df, reused until the database changes"""
+    return _db.get_daily_stats_df(days)
@@ -1,6 +1,11 @@
 # utils/reddit_auth.py
 import praw
 
+# Reddit clients that authenticated successfully, keyed by the full credential tuple.
+# praw caches the OAuth token on the instance, so re-testing known credentials costs
+# one /api/v1/me call instead of a fresh password grant.
+_authenticated_clients = {}
+
 def test_reddit_auth(creds: dict) -> dict:
     """
     Test Reddit API authentication using provided credentials.
@@ -20,21 +25,30 @@ def test_reddit_auth(creds: dict) -> dict:
             "errors": str | None
         }
     """
+    key = None
     try:
-        reddit = praw.Reddit(
-            client_id=creds["client_id"],
-            client_secret=creds["client_secret"],
-            username=creds["username"],
-            password=creds["password"],
-            user_agent=creds["user_agent"],
-        )
+        key = (creds["client_id"], creds["client_secret"], creds["username"],
+               creds["password"], creds["user_agent"])
+        reddit = _authenticated_clients.get(key)
+        if reddit is None:
+            reddit = praw.Reddit(
+                client_id=creds["client_id"],
+                client_secret=creds["client_secret"],
+                username=creds["username"],
+                password=creds["password"],
+                user_agent=creds["user_agent"],
+            )
         
         # Try fetching current user
         me = reddit.user.me()
         if me:
+            _authenticated_clients[key] = reddit
             return {"valid": True, "username": str(me), "errors": None}
         else:
+            _authenticated_clients.pop(key, None)
             return {"valid": False, "username": None, "errors": "Authentication failed (no user)"}
     
     except Exception as e:
+        if key is not None:
+            _authenticated_clients.pop(key, None)
         return {"valid": False, "username": None, "errors": str(e)}
@@ -1,37 +1,89 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import praw
 from dotenv import load_dotenv
 load_dotenv()
+_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
+_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
+# Without an app id and secret every request below fails authentication
+HAS_CREDENTIALS = bool(_CLIENT_ID and _CLIENT_SECRET)
+
 # Initialize Reddit client
 reddit = praw.Reddit(
-    client_id=os.getenv("REDDIT_CLIENT_ID"),
-    client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+    client_id=_CLIENT_ID,
+    client_secret=_CLIENT_SECRET,
     user_agent="agent-approval-dashboard/0.1"
 )
 
+# Most new posts get_unanswered_posts looks through before giving up
+UNANSWERED_SCAN_CAP = 300
+
+@lru_cache(maxsize=32)
+def _subreddit(subreddit_name: str):
+    """Reuse one lazy Subreddit handle per name"""
+    return reddit.subreddit(subreddit_name)
+
+def warm_subreddit(subreddit_name: str):
+    """Build the cached Subreddit handle and member map ahead of the first fetch"""
+    _subreddit(subreddit_name)
+    _members(subreddit_name)
+
 def get_unanswered_posts(subreddit_name: str, limit: int = 10):
-    """Fetch unanswered queries (posts with 0 comments)."""
-    subreddit = reddit.subreddit(subreddit_name)
+    """
+    Fetch unanswered queries (posts with 0 comments).
+    
+    subreddit_name may be a multireddit such as "python+learnpython"; each post then
+    reports the subreddit it was actually posted in.
+    """
+    subreddit = _subreddit(subreddit_name)
+    members = _members(subreddit_name)
     unanswered = []
-    for post in subreddit.new(limit=limit*3):  # fetch more, filter later
+    # praw pages lazily, so the loop below stops fetching as soon as `limit` posts match;
+    # the cap only bounds how far back a quiet subreddit is scanned.
+    for post in subreddit.new(limit=UNANSWERED_SCAN_CAP):
         if post.num_comments == 0 and not post.stickied:
-            unanswered.append({
-                "id": post.id,
-                "title": post.title,
-                "content": post.selftext,
-                "url": f"https://reddit.com{post.permalink}",
-                "author": str(post.author),
-                "created_at": post.created_utc,
-                "subreddit": subreddit_name
-            })
+            unanswered.append(_post_dict(post, subreddit_name, members))
         if len(unanswered) >= limit:
             break
     return unanswered
 
+def stream_new_posts(subreddit_name: str):
+    """
+    Yield unanswered posts as they are submitted, in the same shape as get_unanswered_posts.
+
+    Posts made before the stream started are skipped. Yields None whenever a poll
+    comes back empty so the caller can check for shutdown between posts.
+    """
+    members = _members(subreddit_name)
+    stream = _subreddit(subreddit_name).stream.submissions(skip_existing=True, pause_after=0)
+    for post in stream:
+        if post is None:
+            yield None
+        elif post.num_comments == 0 and not post.stickied:
+            yield _post_dict(post, subreddit_name, members)
+
+@lru_cache(maxsize=32)
+def _members(subreddit_name: str):
+    """Requested spelling of each multireddit member, so rows match the configured names rather than Reddit's casing"""
+    return {name.lower(): name for name in subreddit_name.split('+')} if '+' in subreddit_name else None
+
+def _post_dict(post, subreddit_name: str, members):
+    """Review-queue fields of a submission"""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "content": post.selftext,
+        "url": f"https://reddit.com{post.permalink}",
+        "author": str(post.author),
+        "created_at": post.created_utc,
+        "subreddit": members.get(post.subreddit.display_name.lower(), post.subreddit.display_name) if members else subreddit_name
+    }
+
 def get_subreddit_data(subreddit_name: str, limit: int = 5):
     """Fetch top hot posts from a subreddit"""
     try:
-        subreddit = reddit.subreddit(subreddit_name)
+        subreddit = _subreddit(subreddit_name)
         posts = []
         for post in subreddit.hot(limit=limit):
             posts.append({
@@ -44,3 +96,12 @@ def get_subreddit_data(subreddit_name: str, limit: int = 5):
         return posts
     except Exception as e:
         return {"error": str(e)}
+
+def get_subreddits_data(subreddit_names, limit: int = 5):
+    """Fetch hot posts for several subreddits concurrently, keyed by subreddit name"""
+    names = list(dict.fromkeys(subreddit_names))
+    if not names:
+        return {}
+    # Each fetch is one network round trip; run them side by side on praw's shared session
+    with ThreadPoolExecutor(max_workers=min(8, len(names))) as executor:
+        return dict(zip(names, executor.map(lambda name: get_subreddit_data(name, limit), names)))
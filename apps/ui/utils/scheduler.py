@@ -1,51 +1,206 @@
 # utils/scheduler.py
 from apscheduler.schedulers.background import BackgroundScheduler
-from utils.reddit_client import get_unanswered_posts
+from apscheduler.executors.pool import ThreadPoolExecutor as JobExecutor
+from utils.reddit_client import get_unanswered_posts, stream_new_posts, HAS_CREDENTIALS, warm_subreddit
 from utils.database import DatabaseManager
 import atexit
+import logging
+import queue
+import signal
+import threading
+import time
+import uuid
 from datetime import datetime
 from utils.reddit_client import get_subreddit_data
 
+logger = logging.getLogger(__name__)
+
+# Shared by every scheduler tick; DatabaseManager keeps one connection per worker thread
+_db = None
+_db_lock = threading.Lock()
+
+def _get_db() -> DatabaseManager:
+    """Create the DatabaseManager (and run its schema setup) on first use only"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = DatabaseManager()
+    return _db
+
 def ingest_unanswered_queries(subreddit: str, limit: int = 5):
     """
     Fetch unanswered posts from a subreddit and add them to the DB review queue
     WITHOUT auto-generating AI drafts.
     """
-    db = DatabaseManager()
-    posts = get_unanswered_posts(subreddit, limit=limit)
-    for post in posts:
-        # Only insert if it doesn't exist already
-        if not db.get_request_by_post_id(post["id"]):
-            db.insert_request({
-                "post_id": post["id"],
-                "post_title": post["title"],
-                "post_content": post["content"],
-                "post_url": post["url"],
-                "post_author": post["author"],
-                "created_at": post["created_at"],
-                "subreddit": post["subreddit"],
-                "drafted_reply": "",  # Empty initially
-                "status": "pendin   g",
-                "agent_confidence": 0.0,
-                "citations": "[]"
-            })
+    _ingest_posts(subreddit, limit)
+
+def _ingest_posts(subreddit: str, limit: int) -> int:
+    """Body of ingest_unanswered_queries; returns the number of newly queued posts"""
+    if not HAS_CREDENTIALS:
+        return 0
+    return _queue_posts(get_unanswered_posts(subreddit, limit=limit))
+
+def _queue_posts(posts) -> int:
+    """Add fetched posts to the review queue; returns the number of newly queued posts"""
+    # Tuples in DatabaseManager.POST_ROW_FIELDS order, bound by the INSERT as they are generated;
+    # posts that are already queued are skipped inside the INSERT itself
+    rows = (
+        (
+            str(uuid.uuid4()),
+            post["subreddit"],
+            post["id"],
+            post["title"],
+            post["content"],
+            post["author"],
+            post["url"],
+        )
+        for post in posts
+    )
+    return _get_db().add_post_rows(rows)
+
+# Unanswered posts fetched per monitored subreddit on each scheduled tick
+INGEST_LIMIT_PER_SUB = 5
+
+def _ingest_multireddit(multireddit: str, limit: int):
+    """Scheduled tick: the multireddit name and limit are worked out once by start_scheduler"""
+    _adapt_poll_interval(_ingest_posts(multireddit, limit))
 
 # ---- Scheduler setup ----
-scheduler = BackgroundScheduler()
+# fetch_all is the only job and never overlaps itself, so two workers are plenty
+scheduler = BackgroundScheduler(executors={"default": JobExecutor(2)})
+
+# Polling cadence in minutes: drops to the minimum after a tick that queued posts and
+# doubles after each empty tick, up to the maximum. Every run is jittered by up to a
+# minute so restarts don't line up on the same second.
+POLL_MINUTES_DEFAULT = 15
+POLL_MINUTES_MIN = 5
+POLL_MINUTES_MAX = 60
+POLL_JITTER_SECONDS = 60
+_poll_minutes = POLL_MINUTES_DEFAULT
+
+def _adapt_poll_interval(queued: int):
+    """Reschedule fetch_all faster when posts arrived, slower when none did"""
+    global _poll_minutes
+    if queued:
+        minutes = POLL_MINUTES_MIN
+    else:
+        minutes = min(_poll_minutes * 2, POLL_MINUTES_MAX)
+    if minutes != _poll_minutes and scheduler.get_job("fetch_all"):
+        _poll_minutes = minutes
+        scheduler.reschedule_job("fetch_all", trigger="interval", minutes=minutes, jitter=POLL_JITTER_SECONDS)
+
+# ---- Live stream ----
+# New submissions arrive through praw's stream on one thread and are written in batches
+# by another, so a busy subreddit costs one INSERT per batch instead of one per post.
+STREAM_BATCH_SIZE = 20
+STREAM_BATCH_SECONDS = 10
+STREAM_RETRY_SECONDS = 30
+_post_queue = queue.Queue()
+_stop_streaming = threading.Event()
+
+def _stream_posts(subreddit_name: str):
+    """Push new unanswered posts onto _post_queue until shutdown, reconnecting after errors"""
+    while not _stop_streaming.is_set():
+        try:
+            for post in stream_new_posts(subreddit_name):
+                if _stop_streaming.is_set():
+                    return
+                if post is not None:
+                    _post_queue.put(post)
+        except Exception as e:
+            logger.warning("Reddit stream for r/%s failed, reconnecting in %ss: %s",
+                           subreddit_name, STREAM_RETRY_SECONDS, e)
+            _stop_streaming.wait(STREAM_RETRY_SECONDS)
+
+def _drain_posts():
+    """Queue streamed posts in batches of up to STREAM_BATCH_SIZE or STREAM_BATCH_SECONDS"""
+    while not _stop_streaming.is_set() or not _post_queue.empty():
+        try:
+            batch = [_post_queue.get(timeout=1)]
+        except queue.Empty:
+            continue
+        deadline = time.monotonic() + STREAM_BATCH_SECONDS
+        while len(batch) < STREAM_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or _stop_streaming.is_set():
+                break
+            try:
+                batch.append(_post_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        try:
+            _queue_posts(batch)
+        except Exception as e:
+            logger.error("Failed to queue %d streamed posts: %s", len(batch), e)
+
+def start_streaming(monitored_subs):
+    """Start the stream and batch-writer threads for the monitored subreddits"""
+    _stop_streaming.clear()
+    threads = [
+        threading.Thread(target=_stream_posts, args=("+".join(monitored_subs),), name="reddit-stream", daemon=True),
+        threading.Thread(target=_drain_posts, name="reddit-stream-writer", daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
 
 def start_scheduler(monitored_subs):
     """
     Start a background scheduler to periodically fetch unanswered posts
     and add them to the review queue without generating answers automatically.
+
+    New posts come in through the live stream; the interval job catches up on
+    posts made while the app was down or the stream was reconnecting, and backs
+    off to its maximum interval once the stream keeps the queue current.
     """
-    for sub in monitored_subs:
-        scheduler.add_job(
-            ingest_unanswered_queries,
-            "interval",
-            minutes=15,
-            args=[sub],
-            id=f"fetch_{sub}",
-            replace_existing=True
-        )
+    if scheduler.running:
+        # Already started by another session of the app
+        return
+    if not HAS_CREDENTIALS:
+        # Every fetch would fail authentication; don't spin up threads that only log errors
+        logger.warning("Reddit credentials not configured; background ingestion not started")
+        return
+    monitored_subs = list(monitored_subs)
+    if not monitored_subs:
+        return
+    multireddit = "+".join(monitored_subs)
+    # Resolved once here; every tick and the stream reuse the same Subreddit handle
+    warm_subreddit(multireddit)
+    start_streaming(monitored_subs)
+    # One job and one Reddit listing per cycle, however many subreddits are monitored
+    scheduler.add_job(
+        _ingest_multireddit,
+        "interval",
+        minutes=_poll_minutes,
+        jitter=POLL_JITTER_SECONDS,
+        args=[multireddit, INGEST_LIMIT_PER_SUB * len(monitored_subs)],
+        id="fetch_all",
+        replace_existing=True
+    )
     scheduler.start()
-    atexit.register(lambda: scheduler.shutdown())
+    atexit.register(_shutdown)
+    _install_signal_handlers()
+
+def _shutdown():
+    """Stop the stream and the scheduler without waiting for an in-flight fetch to finish"""
+    _stop_streaming.set()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+def _install_signal_handlers():
+    """Shut down on SIGTERM/SIGINT, then hand the signal to whatever handled it before"""
+    # Python only lets the main thread set handlers; Streamlit runs pages elsewhere and keeps its own
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        previous = signal.getsignal(sig)
+        
+        def handler(signum, frame, previous=previous):
+            _shutdown()
+            if callable(previous):
+                previous(signum, frame)
+            elif previous != signal.SIG_IGN:
+                raise SystemExit(128 + signum)
+        
+        signal.signal(sig, handler)
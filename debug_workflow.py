@@ -205,11 +205,14 @@ def main():
     print("=" * 50)
     print()
     
-    check_environment()
-    check_dry_run_mode()
-    test_markdown_conversion()
-    test_reddit_tool()
-    test_approval_workflow()
+    # Write each check's report in one go instead of one terminal write per line
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    
+    for check in (check_environment, check_dry_run_mode, test_markdown_conversion,
+                  test_reddit_tool, test_approval_workflow):
+        check()
+        sys.stdout.flush()
     
     print("🏁 Debug analysis complete!")
     print()
@@ -7,10 +7,12 @@ Monitors system health, performance, and provides alerts
 import os
 import sys
 import time
+import atexit
 import json
 import logging
 import psutil
 import sqlite3
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, List
@@ -29,12 +31,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Monitors not yet closed, closed by one exit hook; held weakly so dropped monitors can be collected
+_open_monitors = weakref.WeakSet()
+
+@atexit.register
+def _close_open_monitors():
+    """Write buffered health data of any monitor still open at interpreter exit"""
+    for monitor in list(_open_monitors):
+        monitor.close()
+
 class SystemMonitor:
     """System monitoring and health checks"""
     
     def __init__(self):
         self.db_path = "data/agent_data.db"
         self.start_time = datetime.now()
+        # (tables, UNION ALL count query) built by _table_counts_sql
+        self._counts_sql = None
+        # health_logs rows waiting for the next flush. They are written once flush_every rows
+        # are buffered or the oldest is flush_interval seconds old; while writes keep failing,
+        # only the newest max_pending are kept.
+        self._pending: List[tuple] = []
+        self._pending_since = None
+        self._flush_every = 10
+        self._flush_interval = 300.0
+        self._max_pending = 100
+        self._closed = False
+        # One connection for the monitor's lifetime instead of one per check, opened by _get_conn
+        self._conn = None
+        _open_monitors.add(self)
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Return the monitor's connection, opening it on first use; raises sqlite3.Error if the database can't be opened"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                with conn:
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS health_logs (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                            health_data TEXT,
+                            alerts TEXT
+                        )
+                    """)
+            except sqlite3.Error:
+                # Leave _conn unset so the next check tries again
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        """Write buffered health data and close the monitor's database connection; later calls do nothing"""
+        if self._closed:
+            return
+        self._closed = True
+        _open_monitors.discard(self)
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing buffered health data: {e}")
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
         
     def get_system_health(self) -> Dict[str, Any]:
         """Get comprehensive system health metrics"""
@@ -74,19 +137,13 @@ class SystemMonitor:
     def check_database_health(self) -> Dict[str, Any]:
         """Check database connectivity and performance"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            cursor = self._get_conn().cursor()
             
-            # Check table sizes
+            # Check table sizes, all counted by one query
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = cursor.fetchall()
+            tables = tuple(row[0] for row in cursor.fetchall())
             
-            table_stats = {}
-            for table in tables:
-                table_name = table[0]
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                table_stats[table_name] = count
+            table_stats = dict(cursor.execute(self._table_counts_sql(tables)).fetchall()) if tables else {}
             
             # Check recent activity
             cursor.execute("""
@@ -95,8 +152,6 @@ class SystemMonitor:
             """)
             recent_requests = cursor.fetchone()[0]
             
-            conn.close()
-            
             return {
                 "status": "healthy",
                 "tables": table_stats,
@@ -111,6 +166,16 @@ class SystemMonitor:
                 "connection": "failed"
             }
     
+    def _table_counts_sql(self, tables: tuple) -> str:
+        """UNION ALL of one COUNT(*) per table, rebuilt only when the set of tables changes"""
+        if self._counts_sql is None or self._counts_sql[0] != tables:
+            sql = " UNION ALL ".join(
+                "SELECT '{}', COUNT(*) FROM \"{}\"".format(t.replace("'", "''"), t.replace('"', '""'))
+                for t in tables
+            )
+            self._counts_sql = (tables, sql)
+        return self._counts_sql[1]
+    
     def check_agent_health(self) -> Dict[str, Any]:
         """Check agent system health"""
         try:
@@ -232,47 +297,53 @@ class SystemMonitor:
     def save_health_data(self, health_data: Dict[str, Any]):
         """Save health data to database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Create health_logs table if it doesn't exist
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS health_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    health_data TEXT,
-                    alerts TEXT
-                )
-            """)
-            
-            # Insert health data
+            # Buffer health data; the sample time is taken now because the rows are written later
             alerts = self.check_alerts(health_data)
-            cursor.execute("""
-                INSERT INTO health_logs (health_data, alerts)
-                VALUES (?, ?)
-            """, (json.dumps(health_data), json.dumps(alerts)))
-            
-            conn.commit()
-            conn.close()
+            if len(self._pending) >= self._max_pending:
+                # Earlier flushes failed; drop the oldest sample rather than grow without bound
+                del self._pending[0]
+                logger.warning(f"Health data buffer full, dropped the oldest of {self._max_pending} unsaved samples")
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime()),
+                json.dumps(health_data),
+                json.dumps(alerts)
+            ))
+            if (len(self._pending) >= self._flush_every
+                    or time.monotonic() - self._pending_since >= self._flush_interval):
+                self.flush()
             
         except Exception as e:
             logger.error(f"Error saving health data: {e}")
     
+    def flush(self):
+        """Write buffered health data in one transaction"""
+        if not self._pending:
+            return
+        conn = self._get_conn()
+        with conn:
+            conn.executemany("""
+                INSERT INTO health_logs (timestamp, health_data, alerts)
+                VALUES (?, ?, ?)
+            """, self._pending)
+        self._pending.clear()
+        self._pending_since = None
+    
     def get_health_history(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get health data history"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self.flush()
+            cursor = self._get_conn().cursor()
             
             cursor.execute("""
                 SELECT timestamp, health_data, alerts
                 FROM health_logs
-                WHERE timestamp > datetime('now', '-{} hours')
+                WHERE timestamp > datetime('now', ?)
                 ORDER BY timestamp DESC
-            """.format(hours))
+            """, (f'-{int(hours)} hours',))
             
             results = cursor.fetchall()
-            conn.close()
             
             history = []
             for row in results:
@@ -339,6 +410,8 @@ def main():
     except Exception as e:
         logger.error(f"Monitoring error: {e}")
         print(f"\n❌ Monitoring error: {e}")
+    finally:
+        monitor.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,332 @@
+# tests/test_database.py
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import sqlite3
+import json
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from apps.ui.utils.database import (
+    DatabaseManager, STATUS_PENDING, STATUS_POSTING, POSTING_TIMEOUT_MINUTES, COMPRESS_MIN_CHARS, zstandard
+)
+
+class TestDatabaseManager(unittest.TestCase):
+    """Test cases for the SQLite-backed DatabaseManager"""
+
+    def setUp(self):
+        """Create a throwaway database file"""
+        self.test_dir = tempfile.mkdtemp()
+        self.db = DatabaseManager(os.path.join(self.test_dir, "test.db"))
+
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.db.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def _add(self, request_id, status='pending', post_id=None, subreddit='python'):
+        return self.db.add_request({
+            'id': request_id,
+            'subreddit': subreddit,
+            'post_id': post_id or f"post_{request_id}",
+            'post_title': f"Title {request_id}",
+            'post_content': 'Body',
+            'status': status,
+            'drafted_reply': 'Reply'
+        })
+
+    def test_status_counts(self):
+        """Status counts are aggregated per status"""
+        for i, status in enumerate(['pending', 'pending', 'approved', 'rejected']):
+            self._add(f"r{i}", status=status)
+
+        counts = self.db.get_status_counts()
+
+        self.assertEqual(counts, {'pending': 2, 'approved': 1, 'rejected': 1})
+
+    def test_status_counts_empty(self):
+        """An empty table yields no counts"""
+        self.assertEqual(self.db.get_status_counts(), {})
+
+    def test_count(self):
+        """count() totals all rows or a single status"""
+        for i, status in enumerate(['pending', 'pending', 'approved']):
+            self._add(f"r{i}", status=status)
+
+        self.assertEqual(self.db.count(), 3)
+        self.assertEqual(self.db.count('pending'), 2)
+        self.assertEqual(self.db.count('rejected'), 0)
+
+    def test_plain_reply_migration(self):
+        """Databases created before plain_reply existed gain the column"""
+        path = os.path.join(self.test_dir, "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE requests (id TEXT PRIMARY KEY, timestamp DATETIME, subreddit TEXT, post_id TEXT, status TEXT, created_at DATETIME)")
+
+        db = DatabaseManager(path)
+        columns = {row[1] for row in db._conn().execute("PRAGMA table_xinfo(requests)")}
+        db.close()
+
+        self.assertIn('plain_reply', columns)
+        self.assertIn('created_date', columns)
+
+    def test_status_pending_constant(self):
+        """STATUS_PENDING is the value the pending-queue queries filter on"""
+        self.assertEqual(STATUS_PENDING, 'pending')
+        self._add("r1", status=STATUS_PENDING)
+        self.assertEqual([row['id'] for row in self.db.get_pending_requests()], ['r1'])
+
+    def test_misspelled_pending_status_repaired(self):
+        """Rows queued with the old 'pendin   g' typo reach the review queue"""
+        path = os.path.join(self.test_dir, "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE requests (id TEXT PRIMARY KEY, timestamp DATETIME, subreddit TEXT, post_id TEXT, status TEXT, created_at DATETIME)")
+            conn.execute("INSERT INTO requests (id, subreddit, status) VALUES ('r1', 'python', 'pendin   g')")
+
+        db = DatabaseManager(path)
+        counts = db.get_status_counts()
+        db.close()
+
+        self.assertEqual(counts, {'pending': 1})
+
+    def test_connection_shared_between_managers(self):
+        """A second manager on the same file reuses this thread's connection"""
+        other = DatabaseManager(self.db.db_path)
+
+        self.assertIs(other._conn(), self.db._conn())
+        self._add("r1")
+        self.assertEqual(other.count(), 1)
+
+    def test_update_draft_clears_plain_reply(self):
+        """Editing the draft invalidates the stored plain-text rendering"""
+        self.db.add_request({'id': 'r1', 'subreddit': 'python', 'drafted_reply': '**x**', 'plain_reply': 'x'})
+
+        self.db.update_request_draft('r1', '**y**')
+
+        self.assertIsNone(self.db.get_request_by_id('r1')['plain_reply'])
+
+    def test_get_requests_by_ids(self):
+        """Requests are fetched together and keyed by id"""
+        self._add("r1")
+        self._add("r2", status='approved')
+
+        found = self.db.get_requests_by_ids(["r1", "r2", "missing"])
+
+        self.assertEqual(set(found), {"r1", "r2"})
+        self.assertEqual(found["r2"]["status"], "approved")
+        self.assertEqual(self.db.get_requests_by_ids([]), {})
+
+    def test_pending_requests_columnar(self):
+        """Columnar pending view matches the row-wise one"""
+        self._add("r1")
+        self._add("r2")
+        self._add("r3", status='approved')
+
+        columns = self.db.get_pending_requests_columnar()
+        rows = self.db.get_pending_requests()
+
+        self.assertEqual(columns['id'], [row['id'] for row in rows])
+        self.assertEqual(columns['post_title'], [row['post_title'] for row in rows])
+
+    def test_iter_pending_requests(self):
+        """Pending rows stream as sqlite3.Row in the same order as the dict list"""
+        self._add("r1")
+        self._add("r2", status='approved')
+
+        rows = list(self.db.iter_pending_requests())
+
+        self.assertEqual([row['id'] for row in rows], ['r1'])
+        self.assertIsInstance(rows[0], sqlite3.Row)
+
+    def test_pending_requests_columnar_empty(self):
+        """An empty queue still reports every column"""
+        columns = self.db.get_pending_requests_columnar()
+
+        self.assertIn('id', columns)
+        self.assertEqual(columns['id'], [])
+
+    def test_get_recent_requests(self):
+        """Recent requests carry display columns with long text cut short"""
+        self.db.add_request({'id': 'r1', 'subreddit': 'python', 'post_title': 'T',
+                             'post_content': 'x' * 1000, 'drafted_reply': 'y' * 1000})
+
+        recent = self.db.get_recent_requests(5)
+
+        self.assertEqual(len(recent), 1)
+        self.assertEqual(recent[0]['post_title'], 'T')
+        self.assertEqual(len(recent[0]['post_content']), 220)
+        self.assertEqual(len(recent[0]['drafted_reply']), 320)
+        self.assertNotIn('citations', recent[0])
+
+    def test_get_requests_page(self):
+        """Keyset pages cover every row once, including created_at ties"""
+        for i in range(5):
+            self._add(f"r{i}")
+
+        seen = []
+        filters = {'limit': 2}
+        while True:
+            rows, cursor = self.db.get_requests_page(filters)
+            seen.extend(row['id'] for row in rows)
+            if cursor is None:
+                break
+            filters = {'limit': 2, **cursor}
+
+        self.assertEqual(sorted(seen), [f"r{i}" for i in range(5)])
+
+    def test_get_filter_options(self):
+        """Filter options list each subreddit and author once"""
+        self._add("r1", subreddit='python')
+        self._add("r2", subreddit='python')
+        self._add("r3", subreddit='learnpython')
+        self.db.add_request({'id': 'r4', 'subreddit': '', 'post_author': 'alice'})
+
+        options = self.db.get_filter_options()
+
+        self.assertEqual(sorted(options['subreddits']), ['learnpython', 'python'])
+        self.assertEqual(options['authors'], ['alice'])
+
+    def test_approve_and_reject_log(self):
+        """Status change and audit entry are written together"""
+        self._add("r1")
+        self._add("r2")
+
+        self.db.approve_and_log("r1", final_reply="ok", human_feedback="fine", action_data={'edited': False})
+        self.db.reject_and_log("r2", human_feedback="no")
+
+        self.assertEqual(self.db.get_request_by_id("r1")['status'], 'approved')
+        self.assertEqual(self.db.get_request_by_id("r1")['final_reply'], 'ok')
+        self.assertEqual(self.db.get_request_by_id("r2")['status'], 'rejected')
+        actions = self.db._conn().execute(
+            "SELECT action_type, request_id FROM user_actions ORDER BY id"
+        ).fetchall()
+        self.assertEqual([tuple(a) for a in actions], [('request_approved', 'r1'), ('request_rejected', 'r2')])
+
+    def test_claim_and_reject_require_pending(self):
+        """Claiming or rejecting a request that already left the queue does nothing"""
+        self._add("r1")
+        self._add("r2", status='approved')
+
+        self.assertTrue(self.db.claim_request("r1", "posting"))
+        self.assertFalse(self.db.claim_request("r1", "posting"))
+        self.assertFalse(self.db.reject_and_log("r1"))
+        self.assertFalse(self.db.reject_and_log("r2"))
+
+        self.assertEqual(self.db.get_request_by_id("r1")['status'], 'posting')
+        self.assertEqual(self.db.get_request_by_id("r2")['status'], 'approved')
+        self.assertEqual(self.db._conn().execute("SELECT COUNT(*) FROM user_actions").fetchone()[0], 0)
+
+    def test_stale_posting_requeued_on_open(self):
+        """Requests stuck in posting past the timeout go back to pending when the database is opened"""
+        self._add("stale")
+        self._add("fresh")
+        self.db.claim_request("stale", STATUS_POSTING)
+        self.db.claim_request("fresh", STATUS_POSTING)
+        with self.db._conn() as conn:
+            conn.execute(
+                "UPDATE requests SET updated_at = datetime('now', ?) WHERE id = 'stale'",
+                (f"-{POSTING_TIMEOUT_MINUTES + 1} minutes",)
+            )
+
+        self.db.init_database()
+
+        self.assertEqual(self.db.get_request_by_id("stale")['status'], STATUS_PENDING)
+        self.assertEqual(self.db.get_request_by_id("fresh")['status'], STATUS_POSTING)
+
+    def test_add_requests_bulk(self):
+        """Bulk insert writes all rows and skips duplicate ids"""
+        rows = [
+            {'id': 'b1', 'subreddit': 'python', 'post_id': 'p1', 'post_title': 'One'},
+            {'id': 'b2', 'subreddit': 'python', 'post_id': 'p2', 'post_title': 'Two'},
+            {'id': 'b1', 'subreddit': 'python', 'post_id': 'p3', 'post_title': 'Dup'},
+        ]
+
+        inserted = self.db.add_requests_bulk(rows)
+
+        self.assertEqual(inserted, 2)
+        self.assertEqual(self.db.get_status_counts(), {'pending': 2})
+        self.assertEqual(self.db.add_requests_bulk([]), 0)
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_long_post_content_compressed(self):
+        """Long bodies are stored compressed and read back as text"""
+        body = "How do I install this package? " * (COMPRESS_MIN_CHARS // 10)
+        self.db.add_request({'id': 'r1', 'subreddit': 'python', 'post_content': body})
+        self._add("r2")
+
+        stored = self.db._conn().execute(
+            "SELECT post_content, post_content_zstd FROM requests WHERE id = 'r1'"
+        ).fetchone()
+        self.assertIsNone(stored[0])
+        self.assertLess(len(stored[1]), len(body))
+        self.assertEqual(self.db.get_request_by_id('r1')['post_content'], body)
+        self.assertEqual(self.db.get_request_by_id('r2')['post_content'], 'Body')
+        self.assertNotIn('post_content_zstd', self.db.get_pending_requests()[0])
+
+    def test_add_requests_and_log(self):
+        """Requests and their audit entries are written together; skipped duplicates are not logged"""
+        self._add("r1", post_id="p0")
+        rows = [
+            {'id': 'b1', 'subreddit': 'python', 'post_id': 'p1'},
+            {'id': 'b2', 'subreddit': 'python', 'post_id': 'p2'},
+            {'id': 'b3', 'subreddit': 'python', 'post_id': 'p0'},
+        ]
+
+        inserted = self.db.add_requests_and_log(rows, 'draft_generated', [{'confidence': 0.8}, None, {}])
+
+        self.assertEqual(inserted, ['b1', 'b2'])
+        self.assertIsNone(self.db.get_request_by_id('b3'))
+        actions = self.db._conn().execute(
+            "SELECT action_type, request_id, action_data FROM user_actions ORDER BY id"
+        ).fetchall()
+        self.assertEqual([(a[0], a[1], json.loads(a[2])) for a in actions], [
+            ('draft_generated', 'b1', {'confidence': 0.8}),
+            ('draft_generated', 'b2', {}),
+        ])
+
+    def test_add_post_rows(self):
+        """Undrafted posts are queued from a generator of tuples, skipping known posts"""
+        self._add("r1", post_id="p1")
+        rows = ((f"n{i}", 'python', f"p{i}", f"Title {i}", 'Body', 'alice', 'https://reddit.com/x')
+                for i in range(1, 4))
+
+        inserted = self.db.add_post_rows(rows)
+
+        self.assertEqual(inserted, 2)
+        row = self.db.get_request_by_id("n2")
+        self.assertEqual(row['status'], STATUS_PENDING)
+        # Stamped with the time it was queued, like every other request
+        today = self.db._conn().execute("SELECT DATE('now')").fetchone()[0]
+        self.assertEqual(row['created_date'], today)
+        self.assertEqual(row['citations'], '[]')
+        self.assertEqual(self.db.add_post_rows(iter(())), 0)
+
+    def test_add_request_skips_known_post(self):
+        """A second request for the same Reddit post is not stored"""
+        self.assertEqual(self._add("r1", post_id="p1"), "r1")
+        self.assertIsNone(self._add("r2", post_id="p1"))
+        self.assertEqual(self.db.insert_request({'id': 'r3', 'subreddit': 'python', 'post_id': 'p1'}), 'r3')
+
+        self.assertEqual(self.db.count(), 1)
+        self.assertEqual(self.db.add_requests_bulk([
+            {'id': 'b1', 'subreddit': 'python', 'post_id': 'p1'},
+            {'id': 'b2', 'subreddit': 'python', 'post_id': 'p2'},
+            {'id': 'b3', 'subreddit': 'python', 'post_id': 'p2'},
+        ]), 1)
+
+    def test_filter_existing_post_ids(self):
+        """Only post_ids already stored are returned"""
+        self._add("r1", post_id="p1")
+        self._add("r2", post_id="p2")
+
+        existing = self.db.filter_existing_post_ids(["p1", "p3", None])
+
+        self.assertEqual(existing, {"p1"})
+        self.assertEqual(self.db.filter_existing_post_ids([]), set())
+
+if __name__ == '__main__':
+    unittest.main()
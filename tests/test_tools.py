@@ -10,9 +10,10 @@ import shutil
 # Add project root to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+import tools.reddit_tool as reddit_tool_module
 from tools.reddit_tool import RedditTool
 from tools.rag_tool import RAGTool
-from tools.moderation_tools import analyze_text
+from tools.moderation_tools import analyze_text, analyze_text_result
 
 class TestRedditTool(unittest.TestCase):
     """Test cases for Reddit tool functionality"""
@@ -40,6 +41,16 @@ class TestRedditTool(unittest.TestCase):
         # Assertions
         self.assertIsNotNone(reddit_tool)
         mock_praw.Reddit.assert_called_once()
+
+    @unittest.skipIf(reddit_tool_module.requests is None, "requests not installed")
+    @patch('tools.reddit_tool.praw')
+    def test_reddit_tool_pooled_session(self, mock_praw):
+        """praw is handed a requests.Session with a pooled HTTPS adapter"""
+        RedditTool(**self.test_credentials)
+
+        session = mock_praw.Reddit.call_args.kwargs['requestor_kwargs']['session']
+        adapter = session.get_adapter('https://oauth.reddit.com')
+        self.assertEqual(adapter._pool_maxsize, reddit_tool_module.REDDIT_POOL_MAXSIZE)
     
     @patch('tools.reddit_tool.praw')
     def test_search_questions_success(self, mock_praw):
@@ -168,6 +179,30 @@ class TestRAGTool(unittest.TestCase):
         self.assertIsInstance(result, str)
         self.assertGreater(len(result), 0)
 
+    def test_retrieve_and_generate_batch(self):
+        """Batch drafting returns one reply per query, in order"""
+        queries = ["How do I install it?", "", "Where are the docs?"]
+
+        results = self.rag_tool.retrieve_and_generate_batch(queries)
+
+        self.assertEqual(len(results), len(queries))
+        self.assertEqual(results[1], self.rag_tool.retrieve_and_generate(""))
+        self.assertEqual(self.rag_tool.retrieve_and_generate_batch([]), [])
+
+    def test_search_docs_batch_uses_retriever(self):
+        """With a vector store, batch search asks the retriever, matching search_docs per query"""
+        doc = MagicMock(page_content="Install with pip", metadata={"source": "install.md", "section": "Setup"})
+        self.rag_tool.retriever = MagicMock()
+        self.rag_tool.retriever.invoke.return_value = [doc]
+        self.rag_tool.retriever.batch.return_value = [[doc], []]
+        self.rag_tool.embedder = MagicMock()
+
+        results = self.rag_tool.search_docs_batch(["How do I install it?", "Unrelated"])
+
+        self.rag_tool.retriever.batch.assert_called_once_with(["How do I install it?", "Unrelated"])
+        self.rag_tool.embedder.embed_documents.assert_not_called()
+        self.assertEqual(results, [self.rag_tool.search_docs("How do I install it?"), []])
+
 class TestModerationTool(unittest.TestCase):
     """Test cases for moderation tool functionality"""
     
@@ -231,6 +266,17 @@ class TestModerationTool(unittest.TestCase):
         self.assertIn("is_flagged", result)
         self.assertIn("flags", result)
 
+    def test_analyze_text_result(self):
+        """Test the attribute view matches the dict report"""
+        text = "My email is test@example.com and phone is 555-123-4567"
+        report = analyze_text(text)
+        result = analyze_text_result(text)
+        
+        # Assertions
+        self.assertEqual(result.is_flagged, report["is_flagged"])
+        self.assertEqual(result.flags, report["flags"])
+        self.assertIsNone(result.safety_score)
+
 class TestToolIntegration(unittest.TestCase):
     """Test cases for tool integration"""
     
@@ -1,6 +1,7 @@
 # tools/moderation_tool.py
 import re
 import json
+from collections import namedtuple
 from typing import Dict, Any, List
 
 # Enhanced comprehensive keyword lists for better moderation
@@ -37,6 +38,12 @@ PII_PATTERNS = {
     "bitcoin_address": r"\b[13][a-km-zA-HJ-NP-Z1-9]{25,34}\b"
 }
 
+# Patterns the checks below run on every draft, compiled once at import
+_PROFANITY_RES = [(word, re.compile(r'\b' + re.escape(word) + r'\b')) for word in PROFANE_WORDS]
+_PII_RES = {pii_type: re.compile(pattern, re.IGNORECASE) for pii_type, pattern in PII_PATTERNS.items()}
+_RE_NON_DIGIT = re.compile(r'\D')
+_RE_KEY_VALUE = re.compile(r"^(?:.*[=:\s])?['\"]?(.+?)['\"]?$")
+
 def analyze_text(text: str) -> Dict[str, Any]:
     """
     Analyzes the given text for potential moderation issues.
@@ -68,6 +75,18 @@ def analyze_text(text: str) -> Dict[str, Any]:
 
     return report
 
+# Attribute view of an analyze_text report; safety_score is None when no score was computed
+ModerationResult = namedtuple('ModerationResult', 'is_flagged flags safety_score')
+
+def analyze_text_result(text: str) -> ModerationResult:
+    """
+    Same checks as analyze_text, returned as a ModerationResult.
+
+    analyze_text keeps returning a plain dict for existing callers.
+    """
+    report = analyze_text(text)
+    return ModerationResult(report["is_flagged"], report["flags"], report.get("safety_score"))
+
 def check_profanity(text: str, report: Dict[str, Any]):
     """
     Enhanced profanity detection with context awareness and severity levels.
@@ -77,10 +96,9 @@ def check_profanity(text: str, report: Dict[str, Any]):
     text_lower = text.lower()
     found_profanity = []
     
-    for word in PROFANE_WORDS:
+    for word, pattern in _PROFANITY_RES:
         # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(word) + r'\b'
-        if re.search(pattern, text_lower):
+        if pattern.search(text_lower):
             found_profanity.append(word)
     
     if found_profanity:
@@ -105,8 +123,8 @@ def check_pii(text: str, report: Dict[str, Any]):
     """
     pii_found = []
     
-    for pii_type, pattern in PII_PATTERNS.items():
-        matches = re.finditer(pattern, text, re.IGNORECASE)
+    for pii_type, pattern in _PII_RES.items():
+        matches = pattern.finditer(text)
         for match in matches:
             matched_text = match.group()
             
@@ -140,7 +158,7 @@ def _validate_pii_match(pii_type: str, matched_text: str, full_text: str) -> flo
     """
     if pii_type == "phone_number":
         # Check if it looks like a real phone number
-        digits_only = re.sub(r'\D', '', matched_text)
+        digits_only = _RE_NON_DIGIT.sub('', matched_text)
         if len(digits_only) == 10 or (len(digits_only) == 11 and digits_only.startswith('1')):
             return 0.8
         return 0.3
@@ -153,14 +171,14 @@ def _validate_pii_match(pii_type: str, matched_text: str, full_text: str) -> flo
     
     elif pii_type == "ssn":
         # SSN pattern validation
-        digits_only = re.sub(r'\D', '', matched_text)
+        digits_only = _RE_NON_DIGIT.sub('', matched_text)
         if len(digits_only) == 9 and not digits_only.startswith('000'):
             return 0.9
         return 0.2
     
     elif pii_type == "credit_card":
         # Basic Luhn algorithm check could be added here
-        digits_only = re.sub(r'\D', '', matched_text)
+        digits_only = _RE_NON_DIGIT.sub('', matched_text)
         if 13 <= len(digits_only) <= 19:
             return 0.7
         return 0.3
@@ -169,7 +187,7 @@ def _validate_pii_match(pii_type: str, matched_text: str, full_text: str) -> flo
         # API keys are usually longer and have mixed case
         try:
             # Extract the value part after = or : and strip quotes/spaces
-            key_part = re.sub(r"^(?:.*[=:\s])?['\"]?(.+?)['\"]?$", r"\1", matched_text).strip()
+            key_part = _RE_KEY_VALUE.sub(r"\1", matched_text).strip()
         except Exception:
             key_part = matched_text
         if len(key_part) >= 20 and any(c.isupper() for c in key_part) and any(c.islower() for c in key_part):
@@ -183,8 +201,9 @@ def check_keywords(text: str, report: Dict[str, Any]):
     """
     Checks for a list of predefined flagged keywords.
     """
+    text_lower = text.lower()
     for keyword in FLAGGED_KEYWORDS:
-        if keyword.lower() in text.lower():
+        if keyword.lower() in text_lower:
             report["is_flagged"] = True
             report["flags"].append({"type": "keyword", "message": f"Contains flagged keyword: '{keyword}'."})
 
@@ -245,6 +245,28 @@ class RAGTool:
         scored.sort(key=lambda x:x[0],reverse=True)
         return [{"file":d.metadata.get("source"),"section":d.metadata.get("section"),"content":d.page_content} for _,d in scored[:top_k]]
 
+    def search_docs_batch(self,queries,top_k=TOP_K):
+        """search_docs for several queries, returning one result list per query in order"""
+        queries=list(queries)
+        if not queries: return []
+        if self.retriever:
+            # The retriever embeds each query with embed_query, exactly as search_docs does;
+            # Runnable.batch runs those lookups side by side
+            return [[{"file":d.metadata.get("source"),"section":d.metadata.get("section"),"content":d.page_content} for d in docs]
+                    for docs in self.retriever.batch(queries)]
+        # Keyword fallback, reading the corpus once for every query
+        docs=_load_docs()
+        out=[]
+        for q in queries:
+            terms=q.lower().split()
+            scored=[]
+            for d in docs:
+                score=sum(d.page_content.lower().count(t) for t in terms)
+                if score: scored.append((score,d))
+            scored.sort(key=lambda x:x[0],reverse=True)
+            out.append([{"file":d.metadata.get("source"),"section":d.metadata.get("section"),"content":d.page_content} for _,d in scored[:top_k]])
+        return out
+
     def draft_reply(self,q):
         chunks=self.search_docs(q)
         if not chunks: return "No relevant info found in the docs."
@@ -255,11 +277,35 @@ class RAGTool:
             return ans.content if hasattr(ans,"content") else str(ans)
         # fallback
         return "\n".join([f"- {c['content'][:200]}...[from {c['file']}:{c['section']}]" for c in chunks])
+
+    def draft_replies(self,queries):
+        """draft_reply for several queries; retrieval is batched and LLM calls run through llm.batch"""
+        queries=list(queries)
+        results=self.search_docs_batch(queries)
+        replies=["No relevant info found in the docs."]*len(queries)
+        prompts=[]
+        for i,(q,chunks) in enumerate(zip(queries,results)):
+            if not chunks: continue
+            if self.llm:
+                context="\n\n".join([f"{c['file']}:{c['section']} -> {c['content']}" for c in chunks])
+                prompts.append((i,f"Answer based only on this context:\n{context}\nQuestion:{q}\nKeep it concise and cite [from file:Section]"))
+            else:
+                # fallback
+                replies[i]="\n".join([f"- {c['content'][:200]}...[from {c['file']}:{c['section']}]" for c in chunks])
+        if prompts:
+            answers=self.llm.batch([p for _,p in prompts]) if len(prompts)>1 else [self.llm.invoke(prompts[0][1])]
+            for (i,_),ans in zip(prompts,answers):
+                replies[i]=ans.content if hasattr(ans,"content") else str(ans)
+        return replies
     
     def retrieve_and_generate(self, query: str) -> str:
         """Alias for draft_reply to match the interface expected by the agent"""
         return self.draft_reply(query)
 
+    def retrieve_and_generate_batch(self, queries: List[str]) -> List[str]:
+        """Alias for draft_replies, one reply per query in order"""
+        return self.draft_replies(queries)
+
 # --- CLI ---
 if __name__=="__main__":
     p=argparse.ArgumentParser()
@@ -4,6 +4,7 @@ import os
 import time
 import random
 import re
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 
 # Import PRAW and capture exception classes into local aliases so tests that patch
@@ -36,6 +37,51 @@ except Exception:
     class PrawcoreException(Exception):
         pass
 
+# praw talks to Reddit through requests; when it is importable, give praw a pooled session
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
+# Keep-alive connections praw may hold open to reddit.com; sized above the approval workflow's posting pool
+REDDIT_POOL_MAXSIZE = 16
+
+def _pooled_session():
+    """requests.Session with a pooled, keep-alive HTTPS adapter for praw; None keeps praw's default"""
+    if requests is None:
+        return None
+    session = requests.Session()
+    # Only connection failures are retried here: the request never reached Reddit,
+    # so a replayed POST cannot double-post. RedditTool handles rate limits itself.
+    retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=REDDIT_POOL_MAXSIZE, max_retries=retries))
+    return session
+
+@dataclass(frozen=True)
+class RedditCreds:
+    """Reddit account credentials; pass as RedditTool(**asdict(creds), user_agent=...)"""
+    client_id: Optional[str]
+    client_secret: Optional[str]
+    username: Optional[str]
+    password: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> "RedditCreds":
+        """Read the REDDIT_* variables once"""
+        return cls(
+            client_id=os.getenv("REDDIT_CLIENT_ID"),
+            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
+            username=os.getenv("REDDIT_USERNAME"),
+            password=os.getenv("REDDIT_PASSWORD"),
+        )
+
+    @property
+    def complete(self) -> bool:
+        """True when every credential is set"""
+        return all((self.client_id, self.client_secret, self.username, self.password))
+
 class RedditTool:
     """
     A robust and modular tool for interacting with the Reddit API.
@@ -63,12 +109,14 @@ class RedditTool:
             raise ValueError("All Reddit credentials and user_agent must be provided.")
         
         # Use PRAW's built-in authentication for security
+        session = _pooled_session()
         self.reddit = praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
             username=username,
             password=password,
-            user_agent=user_agent
+            user_agent=user_agent,
+            **({"requestor_kwargs": {"session": session}} if session else {})
         )
         # Backoff settings
         self._max_retries = int(os.getenv("REDDIT_MAX_RETRIES", "5"))